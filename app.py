@@ -3,44 +3,512 @@
 Job Hunter - Web UI
 A simple, friendly web interface for job searching and resume tailoring.
 
-Run: python app.py
+Run: python app.py          (or: python app.py --debug for the auto-reloading dev server)
+     gunicorn/waitress-serve: see wsgi.py
 Then open: http://localhost:5050
 """
 import os
+import re
 import sys
+import copy
 import json
+import atexit
+import threading
+import heapq
+import hashlib
+import shutil
+import time
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import quote
 from datetime import datetime
+from uuid import uuid4
 from flask import Flask, render_template, request, redirect, url_for, flash, send_file, jsonify, session
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.utils import secure_filename
 
+# Fast JSON - install with: pip install orjson
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Response compression - install with: pip install flask-compress
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from job_scraper import JobScraper
-from resume_tailor import ResumeTailor
+from resume_tailor import ResumeTailor, PROMPT_VERSION
 from pdf_compiler import PDFCompiler
-from resume_parser import ResumeParser
+from resume_parser import ResumeParser, MAX_FILE_SIZE
 from resume_structurer import ResumeStructurer
 
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
 
 # Initialize components
 DATA_DIR = Path("data")
 OUTPUT_DIR = Path("output")
 UPLOAD_DIR = DATA_DIR / "uploads"
+TAILORED_CACHE_DIR = DATA_DIR / "tailored_cache"
+MASTER_RESUME_PATH = DATA_DIR / "master_resume.json"
+JINJA_CACHE_DIR = DATA_DIR / ".jinja_cache"
 DATA_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 UPLOAD_DIR.mkdir(exist_ok=True)
+TAILORED_CACHE_DIR.mkdir(exist_ok=True)
+JINJA_CACHE_DIR.mkdir(exist_ok=True)
+
+
+def _load_secret_key():
+    """Stable session key, so flashes survive restarts and reloader re-imports"""
+    env_key = os.environ.get("JOBHUNTER_SECRET")
+    if env_key:
+        return env_key
+    
+    key_path = DATA_DIR / ".secret"
+    if key_path.exists():
+        return key_path.read_bytes()
+    
+    key = os.urandom(32)
+    # Created owner-only from the start, so the key is never readable by others
+    try:
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return key_path.read_bytes()  # another process (e.g. the reloader) won the race
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+app.secret_key = _load_secret_key()
 
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB max upload
+_UPLOAD_CHUNK = 64 * 1024  # uploads are streamed to disk in pieces this size
+
+# Let a fronting web server stream PDFs instead of Python (opt-in, proxy only):
+#   Apache/lighttpd: JOBHUNTER_X_SENDFILE=1 -> X-Sendfile: <absolute path>
+#   nginx: JOBHUNTER_X_ACCEL_PREFIX=/protected-output/ -> X-Accel-Redirect, with
+#          location /protected-output/ { internal; alias /path/to/output/; }
+app.config["USE_X_SENDFILE"] = os.environ.get("JOBHUNTER_X_SENDFILE") == "1"
+X_ACCEL_PREFIX = os.environ.get("JOBHUNTER_X_ACCEL_PREFIX", "")
+
+# Compress HTML/JSON responses (job lists can be hundreds of rows)
+if COMPRESS_AVAILABLE:
+    app.config["COMPRESS_MIMETYPES"] = ["text/html", "application/json", "text/css", "application/javascript"]
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]  # brotli first, gzip for everything else
+    app.config["COMPRESS_LEVEL"] = 5
+    app.config["COMPRESS_MIN_SIZE"] = 1024
+    Compress(app)
+
+# Keep compiled page templates on disk so restarts skip the Jinja parse
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=str(JINJA_CACHE_DIR))
+
+# Leading bullet glyphs/dashes pasted in with experience bullets
+_BULLET_PREFIX = re.compile(r'^[\s\u2022\u00b7\-\*\u2013\u2014]+')
 
 scraper = JobScraper(data_dir=str(DATA_DIR))
-tailor = ResumeTailor(master_resume_path=str(DATA_DIR / "master_resume.json"))
-compiler = PDFCompiler(output_dir=str(OUTPUT_DIR))
+tailor = ResumeTailor(
+    master_resume_path=str(MASTER_RESUME_PATH),
+    # Comma-separated Ollama URLs to spread tailoring calls across several servers
+    ollama_hosts=[h for h in os.environ.get("JOBHUNTER_OLLAMA_HOSTS", "").split(",") if h]
+)
+compiler = PDFCompiler(
+    output_dir=str(OUTPUT_DIR),
+    jinja_cache_dir=str(JINJA_CACHE_DIR),
+    backend=os.environ.get("JOBHUNTER_LATEX", "pdflatex")  # or "tectonic" for faster compiles
+)
 resume_parser = ResumeParser(upload_folder=str(UPLOAD_DIR))
-resume_structurer = ResumeStructurer(master_resume_path=str(DATA_DIR / "master_resume.json"))
+resume_structurer = ResumeStructurer(master_resume_path=str(MASTER_RESUME_PATH))
+
+
+# ============================================================================
+# OUTPUT INDEX
+# ============================================================================
+
+# In-memory listing of OUTPUT_DIR, rebuilt only when the directory changes
+_OUTPUT_INDEX = {
+    "mtime_ns": -1,
+    "pdf_stats": {},
+    "resume_rows": None,  # built lazily by resumes()
+    "files_by_jobid": defaultdict(lambda: {"json": [], "pdf": []})
+}
+
+
+# Company slug is the second "_" field of resume_{company}_{job_id}_{date}
+_PDF_COMPANY = re.compile(r"^[^_]*_([^_]*)")
+
+
+# Job IDs are 12 hex chars (MD5/BLAKE2b prefixes); matching the token rather than
+# a fixed "_" position also files renamed copies like "..._20260101 (1).pdf"
+_JOB_ID_TOKEN = re.compile(r"(?<![0-9a-f])[0-9a-f]{12}(?![0-9a-f])")
+
+
+def _job_id_from_stem(stem):
+    """Pull the job ID out of resume_{company}_{job_id}[_{YYYYMMDD}]"""
+    tokens = _JOB_ID_TOKEN.findall(stem)
+    if tokens:
+        return tokens[-1]
+    parts = stem.split("_")
+    if len(parts) > 2 and len(parts[-1]) == 8 and parts[-1].isdigit():
+        return parts[-2]
+    return parts[-1]
+
+
+def _refresh_output_index():
+    """Return the output index, rescanning OUTPUT_DIR only if it changed"""
+    mtime_ns = OUTPUT_DIR.stat().st_mtime_ns
+    if mtime_ns == _OUTPUT_INDEX["mtime_ns"]:
+        return _OUTPUT_INDEX
+
+    pdf_stats = {}
+    files_by_jobid = defaultdict(lambda: {"json": [], "pdf": []})
+    with os.scandir(OUTPUT_DIR) as it:
+        for entry in it:
+            stem, ext = os.path.splitext(entry.name)
+            if ext == ".pdf":
+                st = entry.stat()
+                pdf_stats[entry.name] = st
+            elif ext == ".json":
+                st = entry.stat()
+            else:
+                continue
+            files_by_jobid[_job_id_from_stem(stem)][ext[1:]].append((st.st_mtime, entry.name))
+
+    # Newest first per job; each job only has a handful of files
+    for files in files_by_jobid.values():
+        for kind, entries in files.items():
+            files[kind] = [name for _, name in sorted(entries, reverse=True)]
+
+    _OUTPUT_INDEX["pdf_stats"] = pdf_stats
+    _OUTPUT_INDEX["resume_rows"] = None
+    _OUTPUT_INDEX["files_by_jobid"] = files_by_jobid
+    _OUTPUT_INDEX["mtime_ns"] = mtime_ns
+    return _OUTPUT_INDEX
+
+
+_NO_OUTPUTS = {"json": [], "pdf": []}
+
+
+def _outputs_for_job(job_id):
+    """Tailored JSON and PDF filenames for a job, newest first"""
+    return _refresh_output_index()["files_by_jobid"].get(job_id, _NO_OUTPUTS)
+
+
+def _stat_mtime(item):
+    name, st = item
+    return st.st_mtime, name
+
+
+def _pdfs_by_mtime(pdf_stats, n=None):
+    """PDF names newest first; with n, only the top n via a bounded heap"""
+    if n is None:
+        items = sorted(pdf_stats.items(), key=_stat_mtime, reverse=True)
+    else:
+        items = heapq.nlargest(n, pdf_stats.items(), key=_stat_mtime)
+    return [name for name, _ in items]
+
+
+def _output_dir_mtime():
+    """OUTPUT_DIR's mtime; take it before writing a file you will _register_output"""
+    return OUTPUT_DIR.stat().st_mtime_ns
+
+
+def _register_output(path, dir_mtime_before):
+    """Add a file we just wrote to the index without rescanning OUTPUT_DIR"""
+    if _OUTPUT_INDEX["mtime_ns"] != dir_mtime_before:
+        # Never built, or something else changed the folder since the index
+        # was taken; only a full scan picks that up
+        _OUTPUT_INDEX["mtime_ns"] = -1
+        return
+    
+    path = Path(path)
+    name = path.name
+    kind = path.suffix[1:]
+    if kind not in ("pdf", "json"):
+        return
+    st = path.stat()
+    
+    # Copy-on-write so concurrent readers never see a half-updated mapping or list
+    job_id = _job_id_from_stem(path.stem)
+    by_job = _OUTPUT_INDEX["files_by_jobid"].copy()
+    entry = dict(by_job.get(job_id, _NO_OUTPUTS))
+    entry[kind] = [name] + [n for n in entry[kind] if n != name]
+    by_job[job_id] = entry
+    _OUTPUT_INDEX["files_by_jobid"] = by_job
+    if kind == "pdf":
+        pdf_stats = dict(_OUTPUT_INDEX["pdf_stats"])
+        pdf_stats[name] = st
+        _OUTPUT_INDEX["pdf_stats"] = pdf_stats
+        _OUTPUT_INDEX["resume_rows"] = None
+    _OUTPUT_INDEX["mtime_ns"] = _output_dir_mtime()
+
+
+# ============================================================================
+# JSON FILES
+# ============================================================================
+
+def _read_json(path):
+    """Parse a JSON file (orjson when available)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _write_json(path, data):
+    """Write data as indented JSON (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        raw = json.dumps(data, indent=2).encode()
+    with open(path, 'wb') as f:
+        f.write(raw)
+
+
+# ============================================================================
+# JOB LOOKUP CACHE
+# ============================================================================
+
+@lru_cache(maxsize=256)
+def _get_job_cached(job_id):
+    """Memoized scraper.get_job - cleared by _jobs_changed()"""
+    return scraper.get_job(job_id)
+
+
+def _jobs_changed():
+    """Drop cached lookups after the jobs database is modified"""
+    _get_job_cached.cache_clear()
+
+
+# ============================================================================
+# MASTER RESUME CACHE
+# ============================================================================
+
+_master_cache = {"mtime_ns": -1, "data": None, "dirty": False, "timer": None}
+_master_lock = threading.Lock()
+_MASTER_WRITE_DELAY = 0.5  # seconds of quiet before edits are written out
+
+
+def _load_master_resume():
+    """Return the parsed master resume, re-reading only when the file changes"""
+    with _master_lock:
+        if _master_cache["dirty"]:
+            return _master_cache["data"]  # newer than the file
+        mtime_ns = MASTER_RESUME_PATH.stat().st_mtime_ns
+        if mtime_ns != _master_cache["mtime_ns"]:
+            _master_cache["data"] = _read_json(MASTER_RESUME_PATH)
+            _master_cache["mtime_ns"] = mtime_ns
+        return _master_cache["data"]
+
+
+def _save_master_resume(resume):
+    """Update the cached master resume; the file is written once edits go quiet"""
+    with _master_lock:
+        _master_cache["data"] = resume
+        _master_cache["dirty"] = True
+        if _master_cache["timer"] is not None:
+            _master_cache["timer"].cancel()
+        timer = threading.Timer(_MASTER_WRITE_DELAY, _flush_master_resume)
+        timer.daemon = True
+        _master_cache["timer"] = timer
+        timer.start()
+
+
+def _flush_master_resume():
+    """Write pending master resume edits now (atomically)"""
+    with _master_lock:
+        if _master_cache["timer"] is not None:
+            _master_cache["timer"].cancel()
+            _master_cache["timer"] = None
+        if not _master_cache["dirty"]:
+            return
+        tmp_path = MASTER_RESUME_PATH.with_suffix(".json.tmp")
+        _write_json(tmp_path, _master_cache["data"])
+        os.replace(tmp_path, MASTER_RESUME_PATH)
+        _master_cache["mtime_ns"] = MASTER_RESUME_PATH.stat().st_mtime_ns
+        _master_cache["dirty"] = False
+
+
+atexit.register(_flush_master_resume)
+
+
+# ============================================================================
+# TAILORING CACHE
+# ============================================================================
+
+def _tailor_cached(job):
+    """Tailor the master resume for a job, reusing the stored result for identical inputs"""
+    _flush_master_resume()  # the tailor reads the file, so pending edits must land first
+    master_mtime_ns = MASTER_RESUME_PATH.stat().st_mtime_ns
+    key = hashlib.blake2b("|".join((
+        job['id'],
+        job['description'],
+        tailor.model,
+        tailor.active_bullet_model(),
+        str(PROMPT_VERSION),
+    )).encode()).hexdigest()[:16]
+    # Named by master resume version, so results for older versions can be pruned
+    cache_path = TAILORED_CACHE_DIR / f"{master_mtime_ns}_{key}.json"
+    
+    if cache_path.exists():
+        return _read_json(cache_path)
+    
+    tailored = tailor.tailor_full_resume(
+        job_id=job['id'],
+        job_title=job['title'],
+        company=job['company'],
+        job_description=job['description']
+    )
+    
+    _write_json(cache_path, tailored)
+    _prune_tailored_cache(master_mtime_ns)
+    
+    return tailored
+
+
+def _prune_tailored_cache(master_mtime_ns):
+    """Delete cached results made from an earlier version of the master resume"""
+    current = f"{master_mtime_ns}_"
+    with os.scandir(TAILORED_CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and not entry.name.startswith(current):
+                Path(entry.path).unlink(missing_ok=True)
+
+
+# ============================================================================
+# UPLOAD STAGING
+# ============================================================================
+
+# Extracted resumes wait on disk between upload and confirm; the session
+# cookie only carries the token, so it stays small on every request
+_STAGED_TTL = 24 * 60 * 60  # seconds; abandoned uploads (personal data) are deleted after this
+
+
+def _staged_path(token):
+    return UPLOAD_DIR / f"staged_{token}.json"
+
+
+def _stage_extracted(extracted, error):
+    """Save extracted resume data server-side and remember it in the session"""
+    _clear_staged()
+    _purge_stale_staged()
+    token = uuid4().hex
+    _write_json(_staged_path(token), {"extracted": extracted, "error": error})
+    session['upload_token'] = token
+
+
+def _load_staged():
+    """Return (extracted, error) for this session's upload, or (None, None)"""
+    token = session.get('upload_token')
+    if not token:
+        return None, None
+    try:
+        staged = _read_json(_staged_path(token))
+    except FileNotFoundError:
+        return None, None
+    return staged["extracted"], staged["error"]
+
+
+def _purge_stale_staged():
+    """Delete staged uploads that were never confirmed or replaced"""
+    cutoff = time.time() - _STAGED_TTL
+    with os.scandir(UPLOAD_DIR) as entries:
+        for entry in entries:
+            if entry.name.startswith("staged_") and entry.name.endswith(".json"):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass  # another request got to it first
+
+
+def _clear_staged():
+    """Forget this session's staged upload and delete its file"""
+    token = session.pop('upload_token', None)
+    if token:
+        _staged_path(token).unlink(missing_ok=True)
+
+
+# ============================================================================
+# BACKGROUND TASKS
+# ============================================================================
+
+# Tailoring and PDF compiles run here so requests return immediately
+EXECUTOR = ThreadPoolExecutor(max_workers=2)
+TAILOR_JOBS = {}  # job_id -> Future resolving to (flash message, category)
+TAILOR_STAGES = {}  # job_id -> what the running task is doing right now
+
+
+def _task_stage(job_id):
+    """Human-readable progress for a job's background task"""
+    task = TAILOR_JOBS.get(job_id)
+    if task is None or task.done():
+        return None
+    if not task.running():
+        return "Waiting for another resume to finish..."
+    return TAILOR_STAGES.get(job_id, "Starting...")
+
+
+def _run_tailor(job):
+    """Background task: tailor resume and save JSON for later PDF generation"""
+    try:
+        TAILOR_STAGES[job['id']] = "Tailoring your resume with AI..."
+        tailored = _tailor_cached(job)
+        before = _output_dir_mtime()
+        _register_output(tailor.save_tailored(tailored, str(OUTPUT_DIR)), before)
+        return f"Resume tailored for {job['company']}!", "success"
+    except Exception as e:
+        return f"Tailoring error: {str(e)}. Is Ollama running?", "error"
+
+
+def _run_full_process(job):
+    """Background task: tailor resume and compile it straight to PDF"""
+    try:
+        TAILOR_STAGES[job['id']] = "Step 1 of 2: Tailoring your resume with AI..."
+        tailored = _tailor_cached(job)
+        TAILOR_STAGES[job['id']] = "Step 2 of 2: Building the PDF..."
+        # Own scratch folder: other compiles may be running on the executor.
+        # It lives in RAM (tmpfs), so it goes even when the compile fails
+        work_dir = compiler.make_work_dir()
+        before = _output_dir_mtime()
+        try:
+            pdf_path = compiler.compile_from_dict(tailored, work_dir=work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        if pdf_path:
+            _register_output(pdf_path, before)
+            scraper.update_status(job['id'], "applied")
+            _jobs_changed()
+            return f"Resume ready for {job['company']}! Click Download below.", "success"
+        
+        # Still save the JSON even if PDF fails
+        before = _output_dir_mtime()
+        _register_output(tailor.save_tailored(tailored, str(OUTPUT_DIR)), before)
+        return "Resume tailored but PDF failed. Check LaTeX.", "warning"
+    except Exception as e:
+        return f"Error: {str(e)}", "error"
+
+
+def _submit_tailor_task(job, task):
+    """Queue a background task for a job unless one is already running"""
+    running = TAILOR_JOBS.get(job['id'])
+    if running and not running.done():
+        flash("Already working on this resume. Hang tight!", "info")
+        return
+    
+    TAILOR_STAGES.pop(job['id'], None)
+    TAILOR_JOBS[job['id']] = EXECUTOR.submit(task, job)
+    flash("Tailoring resume... This takes about 30-60 seconds.", "info")
 
 
 # ============================================================================
@@ -51,15 +519,15 @@ resume_structurer = ResumeStructurer(master_resume_path=str(DATA_DIR / "master_r
 def home():
     """Dashboard home page"""
     stats = scraper.get_stats()
-    recent_jobs = scraper.search_saved()[:5]
+    recent_jobs = scraper.search_saved(limit=5)
     
     # Check for recent PDFs
-    recent_pdfs = sorted(OUTPUT_DIR.glob("*.pdf"), key=os.path.getmtime, reverse=True)[:3]
+    recent_pdfs = _pdfs_by_mtime(_refresh_output_index()["pdf_stats"], 3)
     
     return render_template("home.html", 
                          stats=stats, 
                          recent_jobs=recent_jobs,
-                         recent_pdfs=[p.name for p in recent_pdfs])
+                         recent_pdfs=recent_pdfs)
 
 
 @app.route("/search", methods=["GET", "POST"])
@@ -82,6 +550,7 @@ def search():
                 hours_old=72,
                 remote_only=remote_only
             )
+            _jobs_changed()
             
             if jobs:
                 flash(f"Found {len(jobs)} new jobs!", "success")
@@ -119,74 +588,87 @@ def jobs():
 @app.route("/job/<job_id>")
 def job_detail(job_id):
     """View a single job's details"""
-    job = scraper.get_job(job_id)
+    job = _get_job_cached(job_id)
     
     if not job:
         flash("Job not found.", "error")
         return redirect(url_for("jobs"))
     
+    # Report on (or keep waiting for) any background tailoring
+    task = TAILOR_JOBS.get(job_id)
+    if task and task.done():
+        # Two loads can both see it done; only the one that pops it reports it
+        finished = TAILOR_JOBS.pop(job_id, None)
+        if finished:
+            message, category = finished.result()
+            TAILOR_STAGES.pop(job_id, None)
+            flash(message, category)
+        task = None
+    
     # Check if we have a tailored resume for this job
-    tailored_json = list(OUTPUT_DIR.glob(f"*{job_id}*.json"))
-    tailored_pdf = list(OUTPUT_DIR.glob(f"*{job_id}*.pdf"))
+    files = _outputs_for_job(job_id)
+    tailored_pdf = files["pdf"]
     
     return render_template("job_detail.html", 
                          job=job,
-                         has_tailored_json=len(tailored_json) > 0,
+                         has_tailored_json=len(files["json"]) > 0,
                          has_tailored_pdf=len(tailored_pdf) > 0,
-                         pdf_name=tailored_pdf[0].name if tailored_pdf else None)
+                         pdf_name=tailored_pdf[0] if tailored_pdf else None,
+                         tailoring=task is not None,
+                         tailor_stage=_task_stage(job_id))
 
 
 @app.route("/job/<job_id>/tailor", methods=["POST"])
 def tailor_resume(job_id):
     """Tailor resume for a specific job"""
-    job = scraper.get_job(job_id)
+    job = _get_job_cached(job_id)
     
     if not job:
         flash("Job not found.", "error")
         return redirect(url_for("jobs"))
     
-    try:
-        flash("Tailoring resume... This takes about 30-60 seconds.", "info")
-        
-        tailored = tailor.tailor_full_resume(
-            job_id=job['id'],
-            job_title=job['title'],
-            company=job['company'],
-            job_description=job['description']
-        )
-        
-        tailor.save_tailored(tailored, str(OUTPUT_DIR))
-        
-        flash(f"Resume tailored for {job['company']}!", "success")
-        
-    except Exception as e:
-        flash(f"Tailoring error: {str(e)}. Is Ollama running?", "error")
+    _submit_tailor_task(job, _run_tailor)
     
     return redirect(url_for("job_detail", job_id=job_id))
 
 
+@app.route("/job/<job_id>/tailor-status")
+def tailor_status(job_id):
+    """Poll whether background tailoring for a job has finished, and how far along it is"""
+    task = TAILOR_JOBS.get(job_id)
+    return jsonify({"done": task is None or task.done(), "stage": _task_stage(job_id)})
+
+
 @app.route("/job/<job_id>/generate-pdf", methods=["POST"])
 def generate_pdf(job_id):
     """Generate PDF from tailored resume"""
-    job = scraper.get_job(job_id)
+    job = _get_job_cached(job_id)
     
     if not job:
         flash("Job not found.", "error")
         return redirect(url_for("jobs"))
     
     # Find the tailored JSON
-    tailored_files = list(OUTPUT_DIR.glob(f"*{job_id}*.json"))
+    tailored_files = _outputs_for_job(job_id)["json"]
     
     if not tailored_files:
         flash("Please tailor the resume first.", "error")
         return redirect(url_for("job_detail", job_id=job_id))
     
     try:
-        pdf_path = compiler.compile_pdf(str(tailored_files[0]))
+        # Own scratch folder, so removing it can't touch a compile running on the
+        # executor; removed inline either way (milliseconds on tmpfs)
+        work_dir = compiler.make_work_dir()
+        before = _output_dir_mtime()
+        try:
+            pdf_path = compiler.compile_pdf(str(OUTPUT_DIR / tailored_files[0]), work_dir=work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
         
         if pdf_path:
-            compiler.cleanup_temp()
+            _register_output(pdf_path, before)
             scraper.update_status(job_id, "applied")
+            _jobs_changed()
             flash(f"PDF generated! Status updated to 'Applied'.", "success")
         else:
             flash("PDF generation failed. Check LaTeX installation.", "error")
@@ -200,35 +682,13 @@ def generate_pdf(job_id):
 @app.route("/job/<job_id>/full-process", methods=["POST"])
 def full_process(job_id):
     """One-click: tailor + generate PDF"""
-    job = scraper.get_job(job_id)
+    job = _get_job_cached(job_id)
     
     if not job:
         flash("Job not found.", "error")
         return redirect(url_for("jobs"))
     
-    try:
-        # Step 1: Tailor
-        tailored = tailor.tailor_full_resume(
-            job_id=job['id'],
-            job_title=job['title'],
-            company=job['company'],
-            job_description=job['description']
-        )
-        
-        # Step 2: Generate PDF
-        pdf_path = compiler.compile_from_dict(tailored)
-        
-        if pdf_path:
-            compiler.cleanup_temp()
-            scraper.update_status(job_id, "applied")
-            flash(f"Resume ready for {job['company']}! Click Download below.", "success")
-        else:
-            # Still save the JSON even if PDF fails
-            tailor.save_tailored(tailored, str(OUTPUT_DIR))
-            flash("Resume tailored but PDF failed. Check LaTeX.", "warning")
-            
-    except Exception as e:
-        flash(f"Error: {str(e)}", "error")
+    _submit_tailor_task(job, _run_full_process)
     
     return redirect(url_for("job_detail", job_id=job_id))
 
@@ -241,6 +701,7 @@ def update_status(job_id):
     
     if new_status in ["new", "applied", "interviewing", "rejected", "offer"]:
         scraper.update_status(job_id, new_status, notes)
+        _jobs_changed()
         flash(f"Status updated to: {new_status}", "success")
     
     return redirect(url_for("job_detail", job_id=job_id))
@@ -249,10 +710,34 @@ def update_status(job_id):
 @app.route("/download/<filename>")
 def download_file(filename):
     """Download a generated PDF"""
-    file_path = OUTPUT_DIR / filename
+    st = _refresh_output_index()["pdf_stats"].get(filename)
+    
+    if st and X_ACCEL_PREFIX:
+        response = app.response_class(mimetype="application/pdf")
+        response.headers["X-Accel-Redirect"] = X_ACCEL_PREFIX + quote(filename)
+        # Same header send_file builds: a quoted ASCII name plus the UTF-8 original
+        ascii_name = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+        response.headers.set(
+            "Content-Disposition",
+            "attachment",
+            filename=ascii_name,
+            **{"filename*": "UTF-8''" + quote(filename, safe="!#$&+^`|~")}
+        )
+        return response
     
-    if file_path.exists() and filename.endswith(".pdf"):
-        return send_file(file_path, as_attachment=True)
+    if st:
+        response = send_file(
+            OUTPUT_DIR.resolve() / filename,
+            as_attachment=True,
+            conditional=True,
+            last_modified=st.st_mtime,
+            etag=f"{st.st_size:x}-{st.st_mtime_ns:x}"
+        )
+        # Same-day regenerations reuse the filename, so revalidate (cheap 304 via
+        # the ETag) rather than cache forever; private keeps resumes out of shared caches
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
     
     flash("File not found.", "error")
     return redirect(url_for("home"))
@@ -261,33 +746,33 @@ def download_file(filename):
 @app.route("/resumes")
 def resumes():
     """View all generated resumes"""
-    pdfs = sorted(OUTPUT_DIR.glob("*.pdf"), key=os.path.getmtime, reverse=True)
-    jsons = sorted(OUTPUT_DIR.glob("*.json"), key=os.path.getmtime, reverse=True)
+    index = _refresh_output_index()
     
-    resume_files = []
-    for pdf in pdfs:
-        # Extract job info from filename
-        parts = pdf.stem.split("_")
-        resume_files.append({
-            "name": pdf.name,
-            "company": parts[1] if len(parts) > 1 else "Unknown",
-            "date": datetime.fromtimestamp(pdf.stat().st_mtime).strftime("%b %d, %Y"),
-            "size": f"{pdf.stat().st_size / 1024:.1f} KB"
-        })
+    # Rows only change with the directory, so build them once per rescan
+    if index["resume_rows"] is None:
+        resume_files = []
+        for name in _pdfs_by_mtime(index["pdf_stats"]):
+            st = index["pdf_stats"][name]
+            # Extract job info from filename
+            m = _PDF_COMPANY.match(name[:-len(".pdf")])
+            resume_files.append({
+                "name": name,
+                "company": m.group(1) if m else "Unknown",
+                "date": datetime.fromtimestamp(st.st_mtime).strftime("%b %d, %Y"),
+                "size": f"{st.st_size / 1024:.1f} KB"
+            })
+        index["resume_rows"] = resume_files
     
-    return render_template("resumes.html", resumes=resume_files)
+    return render_template("resumes.html", resumes=index["resume_rows"])
 
 
 @app.route("/profile", methods=["GET", "POST"])
 def profile():
     """Edit master resume"""
-    resume_path = DATA_DIR / "master_resume.json"
-    
     if request.method == "POST":
         try:
             # Get form data and update resume
-            with open(resume_path, 'r') as f:
-                resume = json.load(f)
+            resume = copy.deepcopy(_load_master_resume())
             
             # Update personal info
             resume["personal"]["name"] = request.form.get("name", "")
@@ -304,8 +789,7 @@ def profile():
             
             resume["meta"]["last_updated"] = datetime.now().strftime("%Y-%m-%d")
             
-            with open(resume_path, 'w') as f:
-                json.dump(resume, f, indent=2)
+            _save_master_resume(resume)
             
             flash("Profile saved!", "success")
             
@@ -314,27 +798,21 @@ def profile():
         
         return redirect(url_for("profile"))
     
-    # Load current resume
-    with open(resume_path, 'r') as f:
-        resume = json.load(f)
-    
-    return render_template("profile.html", resume=resume)
+    return render_template("profile.html", resume=_load_master_resume())
 
 
 @app.route("/experience", methods=["GET", "POST"])
 def experience():
     """Edit work experience"""
-    resume_path = DATA_DIR / "master_resume.json"
-    
-    with open(resume_path, 'r') as f:
-        resume = json.load(f)
+    resume = _load_master_resume()
     
     if request.method == "POST":
+        resume = copy.deepcopy(resume)
         action = request.form.get("action")
         
         if action == "add":
             new_exp = {
-                "id": f"exp_{len(resume['experience']) + 1:03d}",
+                "id": f"exp_{uuid4().hex[:8]}",
                 "company": request.form.get("company", ""),
                 "title": request.form.get("title", ""),
                 "location": request.form.get("exp_location", ""),
@@ -346,20 +824,22 @@ def experience():
             
             # Parse bullets
             bullets_text = request.form.get("bullets", "")
+            bullet_num = 0
             for line in bullets_text.strip().split("\n"):
-                if line.strip():
+                text = _BULLET_PREFIX.sub("", line).rstrip()
+                if text:
+                    bullet_num += 1
                     new_exp["bullets"].append({
-                        "id": f"bullet_{len(new_exp['bullets']) + 1:03d}",
-                        "original": line.strip().lstrip("•-* "),
+                        "id": f"bullet_{bullet_num:03d}",
+                        "original": text,
                         "keywords": [],
                         "metrics": {},
                         "tailored_versions": {}
                     })
             
-            resume["experience"].insert(0, new_exp)
+            resume["experience"].append(new_exp)
             
-            with open(resume_path, 'w') as f:
-                json.dump(resume, f, indent=2)
+            _save_master_resume(resume)
             
             flash("Experience added!", "success")
         
@@ -367,14 +847,16 @@ def experience():
             exp_id = request.form.get("exp_id")
             resume["experience"] = [e for e in resume["experience"] if e["id"] != exp_id]
             
-            with open(resume_path, 'w') as f:
-                json.dump(resume, f, indent=2)
+            _save_master_resume(resume)
             
             flash("Experience removed.", "success")
         
         return redirect(url_for("experience"))
     
-    return render_template("experience.html", experience=resume.get("experience", []))
+    # Stored in insertion order; show most recent start date first
+    experience = sorted(resume.get("experience", []), key=lambda e: e.get("start_date") or "", reverse=True)
+    
+    return render_template("experience.html", experience=experience)
 
 
 @app.route("/upload", methods=["GET", "POST"])
@@ -392,22 +874,26 @@ def upload():
             flash("No file selected.", "error")
             return redirect(url_for("upload"))
 
-        # Validate file
-        is_valid, error_msg = resume_parser.validate_file(
-            file.filename,
-            file.content_length or len(file.read())
-        )
-        file.seek(0)  # Reset file pointer after reading
-
-        if not is_valid:
-            flash(error_msg, "error")
-            return redirect(url_for("upload"))
+        filename = secure_filename(file.filename)
+        filepath = UPLOAD_DIR / filename
 
         try:
-            # Save uploaded file
-            filename = secure_filename(file.filename)
-            filepath = UPLOAD_DIR / filename
-            file.save(str(filepath))
+            # Stream to disk, counting bytes as we go and stopping once past the limit
+            total = 0
+            with open(filepath, 'wb') as out:
+                while total <= MAX_FILE_SIZE:
+                    chunk = file.stream.read(_UPLOAD_CHUNK)
+                    if not chunk:
+                        break
+                    total += len(chunk)
+                    out.write(chunk)
+
+            # Validate file
+            is_valid, error_msg = resume_parser.validate_file(file.filename, total)
+            if not is_valid:
+                resume_parser.cleanup_temp_file(str(filepath))
+                flash(error_msg, "error")
+                return redirect(url_for("upload"))
 
             # Extract text from file
             ext = resume_parser.get_file_extension(filename)
@@ -444,9 +930,8 @@ def upload():
             # Clean up uploaded file
             resume_parser.cleanup_temp_file(str(filepath))
 
-            # Store extracted data in session for preview
-            session['extracted_resume'] = extracted_data
-            session['extraction_error'] = error
+            # Store extracted data for preview
+            _stage_extracted(extracted_data, error)
 
             return redirect(url_for("upload_preview"))
 
@@ -460,28 +945,22 @@ def upload():
 @app.route("/upload/preview")
 def upload_preview():
     """Preview extracted data before saving"""
-    extracted = session.get('extracted_resume')
-    error = session.get('extraction_error')
+    extracted, error = _load_staged()
 
     if not extracted:
         flash("No extracted data found. Please upload a file first.", "error")
         return redirect(url_for("upload"))
 
-    # Load current master resume
-    resume_path = DATA_DIR / "master_resume.json"
-    with open(resume_path, 'r') as f:
-        current = json.load(f)
-
     return render_template("upload_preview.html",
                          extracted=extracted,
-                         current=current,
+                         current=_load_master_resume(),
                          error=error)
 
 
 @app.route("/upload/confirm", methods=["POST"])
 def upload_confirm():
     """Merge extracted data and save to master resume"""
-    extracted = session.get('extracted_resume')
+    extracted, _ = _load_staged()
 
     if not extracted:
         flash("No extracted data found. Please upload a file first.", "error")
@@ -508,10 +987,8 @@ def upload_confirm():
             }
         }
 
-        # Load current master resume
-        resume_path = DATA_DIR / "master_resume.json"
-        with open(resume_path, 'r') as f:
-            current = json.load(f)
+        # merge_with_master shallow-copies, so keep the cached resume out of its reach
+        current = copy.deepcopy(_load_master_resume())
 
         # Get merge mode
         merge_mode = request.form.get("merge_mode", "merge")
@@ -520,11 +997,11 @@ def upload_confirm():
         merged = resume_structurer.merge_with_master(updated_extracted, current, mode=merge_mode)
 
         # Save merged resume
-        resume_structurer.save_master_resume(merged, str(resume_path))
+        merged.setdefault("meta", {})["last_updated"] = datetime.now().strftime("%Y-%m-%d")
+        _save_master_resume(merged)
 
-        # Clear session data
-        session.pop('extracted_resume', None)
-        session.pop('extraction_error', None)
+        # Clear staged upload
+        _clear_staged()
 
         flash(f"Resume imported successfully! Mode: {merge_mode}", "success")
         return redirect(url_for("profile"))
@@ -561,27 +1038,53 @@ def truncate_text(text, length=100):
     return text[:length] + "..."
 
 
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
 @app.template_filter("format_date")
+@lru_cache(maxsize=1024)  # the same few dozen "YYYY-MM" strings repeat across pages
 def format_date(date_str):
     if not date_str or date_str.lower() == "present":
         return "Present"
-    try:
-        if len(date_str) == 7:
-            dt = datetime.strptime(date_str, "%Y-%m")
-            return dt.strftime("%b %Y")
-    except:
-        pass
+    # YYYY-MM -> "Mon YYYY" without a strptime/strftime round trip
+    if len(date_str) == 7 and date_str[4] == "-" and date_str[:4].isdigit() and date_str[5:].isdigit():
+        month = int(date_str[5:])
+        if 1 <= month <= 12:
+            return f"{_MONTHS[month - 1]} {date_str[:4]}"
     return date_str
 
 
+# Compile page templates at startup so the first request doesn't pay for it
+for _template_name in app.jinja_env.list_templates(extensions=["html"]):
+    app.jinja_env.get_template(_template_name)
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Job Hunter web UI")
+    parser.add_argument("--debug", action="store_true", help="Use the Flask dev server with auto-reload")
+    
+    args = parser.parse_args()
+    
     print("\n" + "=" * 50)
     print("  🎯 Job Hunter")
     print("  Open in browser: http://localhost:5050")
     print("=" * 50 + "\n")
 
-    app.run(debug=True, host="0.0.0.0", port=5050)
+    if args.debug:
+        app.run(debug=True, host="0.0.0.0", port=5050, threaded=True)
+    else:
+        # waitress serves pages on its own threads while tailoring runs on EXECUTOR
+        try:
+            from waitress import serve
+        except ImportError:
+            print("⚠️  waitress not installed. Run: pip install waitress")
+            app.run(host="0.0.0.0", port=5050, threaded=True)
+        else:
+            serve(app, host="0.0.0.0", port=5050, threads=8)
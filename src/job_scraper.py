@@ -3,22 +3,27 @@ Job Scraper Module
 Uses JobSpy to aggregate jobs from LinkedIn, Indeed, Glassdoor, ZipRecruiter
 """
 import json
+import sqlite3
 import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+from operator import attrgetter
 
 # JobSpy import - install with: pip install python-jobspy
 try:
     from jobspy import scrape_jobs
+    import pandas as pd  # JobSpy dependency
     JOBSPY_AVAILABLE = True
 except ImportError:
     JOBSPY_AVAILABLE = False
     print("⚠️  JobSpy not installed. Run: pip install python-jobspy")
 
 
-@dataclass
+@dataclass(slots=True)
 class JobListing:
     """Structured job listing data"""
     id: str
@@ -40,34 +45,150 @@ class JobListing:
         return asdict(self)
 
 
+JOB_COLUMNS = tuple(f.name for f in fields(JobListing))
+
+# JobListing -> row tuple in column order, without asdict()'s deep copy
+_job_row = attrgetter(*JOB_COLUMNS)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    description TEXT,
+    url TEXT,
+    salary_min REAL,
+    salary_max REAL,
+    job_type TEXT,
+    date_posted TEXT,
+    source TEXT,
+    scraped_at TEXT,
+    status TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_status ON jobs(status);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_natural_key ON jobs(title, company, url);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# Trigram tokenizer keeps the old "substring anywhere" search behaviour
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, content='jobs', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF title, description ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO jobs_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+"""
+
+
+_INSERT_JOB = (
+    f"INSERT OR IGNORE INTO jobs ({', '.join(JOB_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(JOB_COLUMNS))})"
+)
+
+
+# JobSpy columns copied into JobListing as strings
+_SCRAPED_TEXT = (
+    "title", "company", "location", "description", "job_url",
+    "job_type", "date_posted", "site"
+)
+
+
+def _hash_job_key(key: str) -> str:
+    # 12 hex chars like the older MD5-based IDs, which stay valid in the DB
+    return hashlib.blake2b(key.encode(), digest_size=6).hexdigest()
+
+
+def _like_pattern(text: str) -> str:
+    """Escape text for a substring LIKE match (LIKE ignores ASCII case)"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _to_float(value) -> Optional[float]:
+    """Coerce pandas/numpy salary values to a plain float (NaN -> None)"""
+    if value is None:
+        return None
+    value = float(value)
+    return None if value != value else value
+
+
 class JobScraper:
     """
-    Scrapes jobs from multiple sources and maintains a local database
+    Scrapes jobs from multiple sources and maintains a local SQLite database
     """
     
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
-        self.jobs_file = self.data_dir / "jobs_database.json"
+        self.db_path = self.data_dir / "jobs.db"
+        self.jobs_file = self.data_dir / "jobs_database.json"  # pre-SQLite store
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.jobs = self._load_jobs()
+        self._fts = False
+        self._stats_cache = None
+        self._init_db()
     
-    def _load_jobs(self) -> dict:
-        """Load existing jobs from JSON database"""
-        if self.jobs_file.exists():
-            with open(self.jobs_file, 'r') as f:
-                return json.load(f)
-        return {"jobs": [], "last_updated": None}
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (one per operation so Flask threads never share one)"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
     
-    def _save_jobs(self):
-        """Save jobs to JSON database"""
-        self.jobs["last_updated"] = datetime.now().isoformat()
-        with open(self.jobs_file, 'w') as f:
-            json.dump(self.jobs, f, indent=2)
+    def _init_db(self):
+        """Create tables and import the legacy JSON database on first run"""
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self._fts = True
+            except sqlite3.OperationalError:
+                print("⚠️  SQLite FTS5 trigram search unavailable, using plain scans")
+            
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                with conn:
+                    self._migrate_json(conn)
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        finally:
+            conn.close()
+    
+    def _migrate_json(self, conn: sqlite3.Connection):
+        """Copy jobs from the old jobs_database.json into SQLite"""
+        if not self.jobs_file.exists():
+            return
+        # stdlib json: the old store was written by json.dump, so salaries can be a bare NaN,
+        # which orjson rejects
+        data = json.loads(self.jobs_file.read_bytes())
+        rows = []
+        for job in data.get("jobs", []):
+            job["salary_min"] = _to_float(job.get("salary_min"))
+            job["salary_max"] = _to_float(job.get("salary_max"))
+            rows.append(tuple(job.get(c) for c in JOB_COLUMNS))
+        conn.executemany(_INSERT_JOB, rows)
+        self._set_last_updated(conn, data.get("last_updated"))
+        print(f"   Imported {len(data.get('jobs', []))} jobs from {self.jobs_file.name}")
+    
+    def _set_last_updated(self, conn: sqlite3.Connection, value: str = None):
+        """Record when the database last changed"""
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+            (value or datetime.now().isoformat(),)
+        )
     
     def _generate_job_id(self, job: dict) -> str:
         """Generate unique ID for a job based on title, company, and URL"""
-        unique_str = f"{job.get('title', '')}-{job.get('company', '')}-{job.get('job_url', '')}"
-        return hashlib.md5(unique_str.encode()).hexdigest()[:12]
+        return _hash_job_key(f"{job.get('title', '')}-{job.get('company', '')}-{job.get('job_url', '')}")
     
     def scrape(
         self,
@@ -104,46 +225,84 @@ class JobScraper:
         print(f"   Looking back: {hours_old} hours")
         
         try:
-            jobs_df = scrape_jobs(
-                site_name=sites,
-                search_term=search_term,
-                location=location,
-                results_wanted=results_wanted,
-                hours_old=hours_old,
-                is_remote=remote_only,
-                job_type=job_type,
-                country_indeed="USA"
-            )
+            # One JobSpy call per site in parallel - wall time is the slowest site, not the sum
+            with ThreadPoolExecutor(max_workers=len(sites)) as pool:
+                futures = {
+                    pool.submit(
+                        scrape_jobs,
+                        site_name=[site],
+                        search_term=search_term,
+                        location=location,
+                        results_wanted=results_wanted,
+                        hours_old=hours_old,
+                        is_remote=remote_only,
+                        job_type=job_type,
+                        country_indeed="USA"
+                    ): site
+                    for site in sites
+                }
+                frames = []
+                for future in as_completed(futures):
+                    try:
+                        frames.append(future.result())
+                    except Exception as e:
+                        print(f"   ⚠️  {futures[future]} failed: {e}")
             
-            new_jobs = []
-            for _, row in jobs_df.iterrows():
-                job_id = self._generate_job_id(row.to_dict())
-                
-                # Skip if we already have this job
-                existing_ids = [j["id"] for j in self.jobs["jobs"]]
-                if job_id in existing_ids:
-                    continue
+            frames = [df for df in frames if not df.empty]
+            jobs_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            
+            # Fill in any columns JobSpy left out so the batch ops below are uniform
+            for col in ("min_amount", "max_amount"):
+                if col not in jobs_df:
+                    jobs_df[col] = None
+            for col in _SCRAPED_TEXT:
+                # map(str) rather than astype(str): pandas 3 keeps NaN through astype
+                jobs_df[col] = jobs_df[col].map(str) if col in jobs_df else ""
+            
+            jobs_df["id"] = (
+                jobs_df["title"] + "-" + jobs_df["company"] + "-" + jobs_df["job_url"]
+            ).map(_hash_job_key)
+            jobs_df = jobs_df.drop_duplicates("id")
+            
+            conn = self._connect()
+            try:
+                # Skip jobs we already have with one set difference. Match on
+                # (title, company, url) since older rows carry MD5-derived IDs
+                existing = self._existing_keys(conn, jobs_df["job_url"].unique().tolist())
+                natural_key = pd.MultiIndex.from_frame(jobs_df[["title", "company", "job_url"]])
+                new_df = jobs_df[~natural_key.isin(existing)]
                 
-                job = JobListing(
-                    id=job_id,
-                    title=str(row.get("title", "")),
-                    company=str(row.get("company", "")),
-                    location=str(row.get("location", "")),
-                    description=str(row.get("description", "")),
-                    url=str(row.get("job_url", "")),
-                    salary_min=row.get("min_amount"),
-                    salary_max=row.get("max_amount"),
-                    job_type=str(row.get("job_type", "")),
-                    date_posted=str(row.get("date_posted", "")),
-                    source=str(row.get("site", "")),
-                    scraped_at=datetime.now().isoformat()
-                )
+                scraped_at = datetime.now().isoformat()
+                new_jobs = [
+                    JobListing(
+                        id=row["id"],
+                        title=row["title"],
+                        company=row["company"],
+                        location=row["location"],
+                        description=row["description"],
+                        url=row["job_url"],
+                        salary_min=_to_float(row["min_amount"]),
+                        salary_max=_to_float(row["max_amount"]),
+                        job_type=row["job_type"],
+                        date_posted=row["date_posted"],
+                        source=row["site"],
+                        scraped_at=scraped_at
+                    )
+                    for row in new_df.to_dict(orient="records")
+                ]
                 
-                new_jobs.append(job)
-                self.jobs["jobs"].append(job.to_dict())
+                with conn:
+                    conn.executemany(
+                        _INSERT_JOB,
+                        map(_job_row, new_jobs)
+                    )
+                    self._set_last_updated(conn)
+                total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            finally:
+                conn.close()
             
-            self._save_jobs()
-            print(f"✅ Found {len(new_jobs)} new jobs (total: {len(self.jobs['jobs'])})")
+            self._stats_cache = None
+            print(f"✅ Found {len(new_jobs)} new jobs (total: {total})")
             
             return new_jobs
             
@@ -151,60 +310,110 @@ class JobScraper:
             print(f"❌ Scraping error: {e}")
             return []
     
-    def search_saved(self, keyword: str = None, company: str = None, status: str = None) -> list[dict]:
-        """Search through saved jobs"""
-        results = self.jobs["jobs"]
+    def _existing_keys(self, conn: sqlite3.Connection, urls: list[str]) -> set[tuple]:
+        """(title, company, url) of saved jobs at any of these URLs"""
+        if not urls:
+            return set()
+        rows = conn.execute(
+            f"SELECT title, company, url FROM jobs WHERE url IN ({', '.join('?' * len(urls))})", urls
+        )
+        return {tuple(row) for row in rows}
+    
+    def search_saved(
+        self,
+        keyword: str = None,
+        company: str = None,
+        status: str = None,
+        limit: int = None
+    ) -> list[dict]:
+        """Search through saved jobs (at most `limit` rows, oldest first)"""
+        where = []
+        params = []
         
         if keyword:
             keyword = keyword.lower()
-            results = [
-                j for j in results 
-                if keyword in j["title"].lower() or keyword in j["description"].lower()
-            ]
+            if self._fts and len(keyword) >= 3:
+                # Quoted so FTS treats the keyword as a literal substring
+                where.append("rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+                params.append('"' + keyword.replace('"', '""') + '"')
+            else:
+                where.append("(title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')")
+                params += [_like_pattern(keyword)] * 2
         
         if company:
-            company = company.lower()
-            results = [j for j in results if company in j["company"].lower()]
+            where.append("company LIKE ? ESCAPE '\\'")
+            params.append(_like_pattern(company.lower()))
         
         if status:
-            results = [j for j in results if j["status"] == status]
+            where.append("status = ?")
+            params.append(status)
         
-        return results
+        sql = "SELECT * FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
     
     def update_status(self, job_id: str, status: str, notes: str = None):
         """Update the status of a job application"""
-        for job in self.jobs["jobs"]:
-            if job["id"] == job_id:
-                job["status"] = status
-                if notes:
-                    job["notes"] = notes
-                self._save_jobs()
-                return True
-        return False
+        conn = self._connect()
+        try:
+            with conn:
+                cur = conn.execute(
+                    "UPDATE jobs SET status = ?, notes = COALESCE(?, notes) WHERE id = ?",
+                    (status, notes or None, job_id)
+                )
+                if not cur.rowcount:
+                    return False
+                self._set_last_updated(conn)
+        finally:
+            conn.close()
+        
+        self._stats_cache = None
+        return True
     
     def get_job(self, job_id: str) -> Optional[dict]:
         """Get a specific job by ID"""
-        for job in self.jobs["jobs"]:
-            if job["id"] == job_id:
-                return job
-        return None
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return dict(row) if row else None
     
     def get_stats(self) -> dict:
-        """Get statistics about saved jobs"""
-        jobs = self.jobs["jobs"]
-        return {
-            "total": len(jobs),
-            "by_status": {
-                "new": len([j for j in jobs if j["status"] == "new"]),
-                "applied": len([j for j in jobs if j["status"] == "applied"]),
-                "interviewing": len([j for j in jobs if j["status"] == "interviewing"]),
-                "rejected": len([j for j in jobs if j["status"] == "rejected"]),
-                "offer": len([j for j in jobs if j["status"] == "offer"]),
-            },
-            "by_source": {},
-            "last_updated": self.jobs.get("last_updated")
-        }
-
+        """Get statistics about saved jobs (cached until the next write)"""
+        if self._stats_cache is None:
+            conn = self._connect()
+            try:
+                status_counts = Counter(dict(conn.execute(
+                    "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+                ).fetchall()))
+                by_source = dict(conn.execute(
+                    "SELECT source, COUNT(*) FROM jobs GROUP BY source"
+                ).fetchall())
+                row = conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+            finally:
+                conn.close()
+            
+            self._stats_cache = {
+                "total": sum(status_counts.values()),
+                "by_status": {
+                    status: status_counts[status]
+                    for status in ("new", "applied", "interviewing", "rejected", "offer")
+                },
+                "by_source": by_source,
+                "last_updated": row[0] if row else None
+            }
+        return self._stats_cache
 
 # CLI for standalone testing
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+"""
+JSON Scan Module
+Finds the JSON object or array inside a chatty LLM reply in one forward pass
+"""
+import re
+from typing import Iterable, Optional
+
+# Only brackets, quotes and backslashes matter to the scan; jump between them
+_TOKENS = {
+    '{': (re.compile(r'[{}"\\]'), '}'),
+    '[': (re.compile(r'[\[\]"\\]'), ']'),
+}
+
+
+def scan_json(text: str, opener: str = '{') -> Optional[str]:
+    """
+    Return the first balanced {...} (or [...]) span in text, or None
+
+    Brackets inside string literals are ignored, so a "}" in a bullet point
+    doesn't end the object early. Linear in len(text), unlike a greedy regex.
+    """
+    tokens, closer = _TOKENS[opener]
+    start = text.find(opener)
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    for match in tokens.finditer(text, start):
+        i = match.start()
+        if i == escaped_at:
+            continue
+        ch = match.group()
+        if in_string:
+            if ch == '\\':
+                escaped_at = i + 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
+
+
+def read_until_json(pieces: Iterable[str], opener: str = '{') -> str:
+    """
+    Join streamed text pieces, stopping as soon as a complete JSON value is in
+
+    Anything a model says after its closing bracket (code fences, apologies,
+    a second copy) is never waited for. Returns the text read so far.
+    """
+    closer = _TOKENS[opener][1]
+    parts = []
+    for piece in pieces:
+        parts.append(piece)
+        if closer in piece:
+            text = "".join(parts)
+            if scan_json(text, opener) is not None:
+                return text
+    return "".join(parts)
@@ -2,21 +2,73 @@
 PDF Compiler Module
 Takes tailored resume JSON and compiles to PDF using LaTeX
 """
+import os
+import atexit
+import re
 import json
 import subprocess
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Optional
 
 # Jinja2 for templating - install with: pip install jinja2
 try:
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
+    from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
     JINJA_AVAILABLE = True
 except ImportError:
     JINJA_AVAILABLE = False
     print("⚠️  Jinja2 not installed. Run: pip install jinja2")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# pdflatex: the classic TeX Live/MiKTeX engine
+# tectonic: self-contained engine with cached resources and built-in reruns,
+#           much faster to start - install with: brew install tectonic
+LATEX_BACKENDS = ("pdflatex", "tectonic")
+
+# Characters that need escaping in LaTeX, applied in one translate() pass
+_LATEX_ESCAPES = str.maketrans({
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+})
+
+# Macros whose output depends on the .aux file from a previous pass
+_CROSS_REFS = re.compile(r'\\(?:ref|pageref|cite|label|tableofcontents|listoffigures|bibliography)\b')
+
+# YYYY-MM or YYYY-MM-DD; month names are spelled out here rather than going
+# through strptime/strftime, which are slow for something this small
+_ISO_DATE = re.compile(r'([0-9]{4})-([0-9]{2})(?:-([0-9]{2}))?')
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _default_temp_dir() -> Path:
+    """LaTeX scratch space: tmpfs when the OS has one, so .aux/.log churn stays in RAM"""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        # Random name, created 0700: /dev/shm is shared by every local user
+        temp_dir = Path(tempfile.mkdtemp(prefix="jobhunter_latex_", dir=shm))
+        atexit.register(shutil.rmtree, temp_dir, ignore_errors=True)
+        return temp_dir
+    return Path(".latex_temp")
+
 
 class PDFCompiler:
     """
@@ -27,20 +79,35 @@ class PDFCompiler:
         self,
         templates_dir: str = "templates",
         output_dir: str = "output",
-        temp_dir: str = ".latex_temp"
+        temp_dir: Optional[str] = None,
+        backend: str = "pdflatex",
+        jinja_cache_dir: Optional[str] = None
     ):
+        if backend not in LATEX_BACKENDS:
+            raise ValueError(f"Unknown LaTeX backend: {backend} (use one of {', '.join(LATEX_BACKENDS)})")
+        self.backend = backend
         self.templates_dir = Path(templates_dir)
         self.output_dir = Path(output_dir)
-        self.temp_dir = Path(temp_dir)
+        self.temp_dir = Path(temp_dir) if temp_dir else _default_temp_dir()
         
         # Create directories
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         
+        # Parsed LaTeX templates and static parts by name; edits need a restart
+        self._templates = {}
+        self._static = {}
+        self._latex_available = None
+        
         # Setup Jinja2 with LaTeX-friendly delimiters
         if JINJA_AVAILABLE:
+            bytecode_cache = None
+            if jinja_cache_dir:
+                Path(jinja_cache_dir).mkdir(parents=True, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(str(jinja_cache_dir))
             self.env = Environment(
                 loader=FileSystemLoader(str(self.templates_dir)),
+                bytecode_cache=bytecode_cache,
                 autoescape=False,  # LaTeX handles its own escaping
                 block_start_string='<%',
                 block_end_string='%>',
@@ -49,103 +116,113 @@ class PDFCompiler:
                 comment_start_string='<#',
                 comment_end_string='#>'
             )
+            # Escaping happens only for the fields a template actually emits
+            self.env.filters['latex'] = self._escape_latex
+            self.env.globals['static'] = self._static_text
+    
+    def _get_template(self, template_name: str):
+        """Load a LaTeX template once and reuse it for every compile"""
+        template = self._templates.get(template_name)
+        if template is None:
+            template = self._templates[template_name] = self.env.get_template(template_name)
+        return template
+    
+    def _static_text(self, name: str) -> str:
+        """Verbatim text of a static template part (e.g. the preamble), read once"""
+        text = self._static.get(name)
+        if text is None:
+            text = self._static[name] = (self.templates_dir / name).read_text(encoding='utf-8')
+        return text
     
     def _check_latex(self) -> bool:
-        """Check if pdflatex is available"""
-        try:
-            result = subprocess.run(
-                ["pdflatex", "--version"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        """Check if the LaTeX backend is on PATH (a hit is remembered, a miss is rechecked)"""
+        if not self._latex_available:
+            self._latex_available = shutil.which(self.backend) is not None
+        return self._latex_available
+    
+    def _latex_command(self, tex_file: Path) -> list:
+        """Command line that compiles tex_file into the directory it sits in"""
+        out_dir = str(tex_file.parent)
+        if self.backend == "tectonic":
+            return ["tectonic", "-X", "compile", "--outdir", out_dir, str(tex_file)]
+        return [
+            "pdflatex",
+            "-interaction=nonstopmode",
+            "-output-directory", out_dir,
+            str(tex_file)
+        ]
     
-    def _escape_latex(self, text: str) -> str:
+    @staticmethod
+    def _escape_latex(text: str) -> str:
         """Escape special LaTeX characters"""
-        if not text:
-            return ""
-        
-        # Characters that need escaping in LaTeX
-        special_chars = {
-            '&': r'\&',
-            '%': r'\%',
-            '$': r'\$',
-            '#': r'\#',
-            '_': r'\_',
-            '{': r'\{',
-            '}': r'\}',
-            '~': r'\textasciitilde{}',
-            '^': r'\textasciicircum{}',
-        }
-        
-        for char, escaped in special_chars.items():
-            text = text.replace(char, escaped)
-        
-        return text
+        return text.translate(_LATEX_ESCAPES) if text else ""
     
-    def _format_date(self, date_str: str) -> str:
-        """Format date string for resume (YYYY-MM -> Month Year)"""
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _format_date(date_str: str) -> str:
+        """Format date string for resume (YYYY-MM or YYYY-MM-DD -> Month Year)"""
         if not date_str or date_str.lower() == "present":
             return "Present"
         
-        try:
-            if len(date_str) == 7:  # YYYY-MM format
-                dt = datetime.strptime(date_str, "%Y-%m")
-                return dt.strftime("%b %Y")
-            elif len(date_str) == 10:  # YYYY-MM-DD format
-                dt = datetime.strptime(date_str, "%Y-%m-%d")
-                return dt.strftime("%b %Y")
-        except ValueError:
-            pass
+        match = _ISO_DATE.fullmatch(date_str)
+        if match:
+            year, month, day = match.groups()
+            try:
+                # date() rejects impossible days just as strptime did
+                date(int(year), int(month), int(day or 1))
+            except ValueError:
+                return date_str
+            return f"{_MONTHS[int(month) - 1]} {year}"
         
         return date_str
     
     def _prepare_template_data(self, resume_data: dict) -> dict:
-        """Prepare resume data for LaTeX template injection"""
+        """Prepare resume data for LaTeX template injection (escaped by the template's | latex filter)"""
         personal = resume_data.get("personal", {})
         
-        # Prepare experience with escaped text and formatted dates
-        experience = []
-        for job in resume_data.get("experience", []):
-            exp = {
-                "company": self._escape_latex(job.get("company", "")),
-                "title": self._escape_latex(job.get("title", "")),
-                "location": self._escape_latex(job.get("location", "")),
-                "start_date": self._format_date(job.get("start_date", "")),
-                "end_date": self._format_date(job.get("end_date", "Present")),
-                "bullets": [self._escape_latex(b) for b in job.get("bullets", [])]
+        format_date = self._format_date  # one lookup instead of one per date
+        
+        # Prepare experience with formatted dates
+        experience = [
+            {
+                "company": job.get("company", ""),
+                "title": job.get("title", ""),
+                "location": job.get("location", ""),
+                "start_date": format_date(job.get("start_date", "")),
+                "end_date": format_date(job.get("end_date", "Present")),
+                "bullets": job.get("bullets", [])
             }
-            experience.append(exp)
+            for job in resume_data.get("experience", [])
+        ]
         
         # Prepare education
-        education = []
-        for edu in resume_data.get("education", []):
-            education.append({
-                "institution": self._escape_latex(edu.get("institution", "")),
-                "degree": self._escape_latex(edu.get("degree", "")),
-                "field": self._escape_latex(edu.get("field", "")),
-                "graduation_date": self._format_date(edu.get("graduation_date", "")),
+        education = [
+            {
+                "institution": edu.get("institution", ""),
+                "degree": edu.get("degree", ""),
+                "field": edu.get("field", ""),
+                "graduation_date": format_date(edu.get("graduation_date", "")),
                 "gpa": edu.get("gpa", "")
-            })
+            }
+            for edu in resume_data.get("education", [])
+        ]
         
         # Prepare skills
         skills = resume_data.get("skills", {})
         skills_prepared = {
-            "technical": [self._escape_latex(s) for s in skills.get("technical", [])],
-            "tools": [self._escape_latex(s) for s in skills.get("tools", [])],
-            "soft": [self._escape_latex(s) for s in skills.get("soft", [])],
-            "certifications": [self._escape_latex(s) for s in skills.get("certifications", [])]
+            "technical": skills.get("technical", []),
+            "tools": skills.get("tools", []),
+            "soft": skills.get("soft", []),
+            "certifications": skills.get("certifications", [])
         }
         
         return {
-            "name": self._escape_latex(personal.get("name", "")),
-            "email": self._escape_latex(personal.get("email", "")),
-            "phone": self._escape_latex(personal.get("phone", "")),
-            "location": self._escape_latex(personal.get("location", "")),
+            "name": personal.get("name", ""),
+            "email": personal.get("email", ""),
+            "phone": personal.get("phone", ""),
+            "location": personal.get("location", ""),
             "linkedin": personal.get("linkedin", ""),
-            "summary": self._escape_latex(resume_data.get("summary", personal.get("summary", ""))),
+            "summary": resume_data.get("summary", personal.get("summary", "")),
             "experience": experience,
             "education": education,
             "skills": skills_prepared
@@ -155,7 +232,8 @@ class PDFCompiler:
         self,
         resume_json_path: str,
         template_name: str = "resume_template.tex",
-        output_name: Optional[str] = None
+        output_name: Optional[str] = None,
+        work_dir: Optional[Path] = None
     ) -> Optional[Path]:
         """
         Compile a tailored resume JSON to PDF
@@ -164,29 +242,42 @@ class PDFCompiler:
             resume_json_path: Path to the tailored resume JSON
             template_name: Name of the LaTeX template file
             output_name: Custom output filename (without extension)
+            work_dir: Where LaTeX writes its files (default: the shared temp dir)
         
         Returns:
             Path to the generated PDF or None if failed
         """
-        if not JINJA_AVAILABLE:
-            raise ImportError("Jinja2 is required. Run: pip install jinja2")
-        
-        if not self._check_latex():
-            raise EnvironmentError("pdflatex not found. Install TeX Live or MiKTeX.")
-        
         # Load resume data
         resume_path = Path(resume_json_path)
         if not resume_path.exists():
             raise FileNotFoundError(f"Resume JSON not found: {resume_path}")
         
-        with open(resume_path, 'r') as f:
-            resume_data = json.load(f)
+        raw = resume_path.read_bytes()
+        resume_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        
+        return self._compile_pdf_from_data(resume_data, template_name, output_name, work_dir)
+    
+    def _compile_pdf_from_data(
+        self,
+        resume_data: dict,
+        template_name: str,
+        output_name: Optional[str],
+        work_dir: Optional[Path]
+    ) -> Optional[Path]:
+        """Render resume data into the LaTeX template and compile it to PDF"""
+        if not JINJA_AVAILABLE:
+            raise ImportError("Jinja2 is required. Run: pip install jinja2")
+        
+        if not self._check_latex():
+            if self.backend == "tectonic":
+                raise EnvironmentError("tectonic not found. Install with: brew install tectonic")
+            raise EnvironmentError("pdflatex not found. Install TeX Live or MiKTeX.")
         
         # Prepare data for template
         template_data = self._prepare_template_data(resume_data)
         
         # Load and render template
-        template = self.env.get_template(template_name)
+        template = self._get_template(template_name)
         rendered_latex = template.render(**template_data)
         
         # Write to temp file
@@ -199,42 +290,49 @@ class PDFCompiler:
             timestamp = datetime.now().strftime("%Y%m%d")
             base_name = f"resume_{company}_{job_id}_{timestamp}"
         
-        tex_file = self.temp_dir / f"{base_name}.tex"
+        work_dir = Path(work_dir) if work_dir else self.temp_dir
+        tex_file = work_dir / f"{base_name}.tex"
         with open(tex_file, 'w') as f:
             f.write(rendered_latex)
         
         print(f"📄 Compiling PDF: {base_name}.pdf")
         
-        # Compile with pdflatex (run twice for proper formatting)
+        # One pdflatex pass is enough unless the document uses cross-references,
+        # or LaTeX itself asks for a rerun (like latexmk does). Tectonic decides
+        # on reruns by itself, so it is always invoked once
+        needs_second_pass = _CROSS_REFS.search(rendered_latex) is not None
         try:
             for i in range(2):
                 result = subprocess.run(
-                    [
-                        "pdflatex",
-                        "-interaction=nonstopmode",
-                        "-output-directory", str(self.temp_dir),
-                        str(tex_file)
-                    ],
+                    self._latex_command(tex_file),
                     capture_output=True,
                     text=True,
                     timeout=60
                 )
                 
+                if self.backend == "tectonic":
+                    if result.returncode != 0:
+                        print(f"⚠️  Tectonic error: {result.stderr.strip()[-500:]}")
+                    break
+                if i == 0 and not (needs_second_pass or "Rerun to get" in result.stdout):
+                    break
                 if result.returncode != 0 and i == 1:
                     print(f"⚠️  LaTeX warnings (usually safe to ignore)")
             
             # Move PDF to output directory
-            pdf_temp = self.temp_dir / f"{base_name}.pdf"
+            pdf_temp = work_dir / f"{base_name}.pdf"
             pdf_output = self.output_dir / f"{base_name}.pdf"
             
-            if pdf_temp.exists():
-                shutil.move(str(pdf_temp), str(pdf_output))
-                print(f"✅ PDF created: {pdf_output}")
-                return pdf_output
-            else:
+            try:
+                os.replace(pdf_temp, pdf_output)  # one rename when both dirs share a filesystem
+            except FileNotFoundError:
                 print(f"❌ PDF compilation failed")
-                print(f"   Check logs in: {self.temp_dir}")
+                print(f"   Check logs in: {work_dir}")
                 return None
+            except OSError:
+                shutil.move(pdf_temp, pdf_output)  # temp dir on another filesystem
+            print(f"✅ PDF created: {pdf_output}")
+            return pdf_output
                 
         except subprocess.TimeoutExpired:
             print("❌ LaTeX compilation timed out")
@@ -247,24 +345,60 @@ class PDFCompiler:
         self,
         resume_data: dict,
         template_name: str = "resume_template.tex",
-        output_name: Optional[str] = None
+        output_name: Optional[str] = None,
+        work_dir: Optional[Path] = None
     ) -> Optional[Path]:
         """
         Compile directly from a resume dictionary (without saving JSON first)
         """
-        # Save to temp JSON
-        temp_json = self.temp_dir / "temp_resume.json"
-        with open(temp_json, 'w') as f:
-            json.dump(resume_data, f)
+        return self._compile_pdf_from_data(resume_data, template_name, output_name, work_dir)
+    
+    def make_work_dir(self) -> Path:
+        """A fresh scratch folder under the temp dir, for one compile that may run alongside others"""
+        work_dir = self.temp_dir / uuid4().hex
+        work_dir.mkdir(parents=True)
+        return work_dir
+    
+    def compile_many(
+        self,
+        resume_json_paths: list,
+        template_name: str = "resume_template.tex",
+        max_workers: Optional[int] = None
+    ) -> list:
+        """
+        Compile several tailored resume JSONs in parallel
+        
+        Each compile runs in its own scratch folder under the temp dir so
+        .aux/.log files never collide; the folder is removed on success and
+        kept (for its logs) on failure.
+        
+        Returns:
+            Output PDF paths (None where a compile failed), in input order
+        """
+        def compile_one(resume_json_path):
+            work_dir = self.make_work_dir()
+            try:
+                pdf_path = self.compile_pdf(resume_json_path, template_name, work_dir=work_dir)
+            except Exception as e:
+                print(f"❌ {resume_json_path}: {e}")
+                return None
+            if pdf_path:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            return pdf_path
         
-        return self.compile_pdf(str(temp_json), template_name, output_name)
+        # pdflatex runs as a separate process, so threads are enough to use every core
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(compile_one, resume_json_paths))
     
     def cleanup_temp(self):
         """Remove temporary LaTeX files"""
         if self.temp_dir.exists():
-            for ext in [".aux", ".log", ".out", ".tex"]:
-                for f in self.temp_dir.glob(f"*{ext}"):
-                    f.unlink()
+            exts = {".aux", ".log", ".out", ".tex"}
+            with os.scandir(self.temp_dir) as entries:  # one directory scan for all suffixes
+                for entry in entries:
+                    if os.path.splitext(entry.name)[1] in exts and entry.is_file():
+                        Path(entry.path).unlink(missing_ok=True)
             print("🧹 Cleaned up temporary files")
 
 
@@ -273,23 +407,28 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="PDF Compiler CLI")
-    parser.add_argument("resume_json", help="Path to tailored resume JSON")
+    parser.add_argument("resume_json", nargs="+", help="Path(s) to tailored resume JSON")
     parser.add_argument("--template", "-t", help="Template name", default="resume_template.tex")
     parser.add_argument("--output", "-o", help="Output filename (without .pdf)")
     parser.add_argument("--cleanup", action="store_true", help="Clean temp files after")
+    parser.add_argument("--backend", "-b", choices=LATEX_BACKENDS, default="pdflatex", help="LaTeX engine")
     
     args = parser.parse_args()
     
-    compiler = PDFCompiler()
+    compiler = PDFCompiler(backend=args.backend)
     
-    pdf_path = compiler.compile_pdf(
-        args.resume_json,
-        template_name=args.template,
-        output_name=args.output
-    )
+    if len(args.resume_json) == 1:
+        pdf_paths = [compiler.compile_pdf(
+            args.resume_json[0],
+            template_name=args.template,
+            output_name=args.output
+        )]
+    else:
+        pdf_paths = compiler.compile_many(args.resume_json, template_name=args.template)
     
     if args.cleanup:
         compiler.cleanup_temp()
     
-    if pdf_path:
-        print(f"\n🎉 Resume ready: {pdf_path}")
+    for pdf_path in pdf_paths:
+        if pdf_path:
+            print(f"\n🎉 Resume ready: {pdf_path}")
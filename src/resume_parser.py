@@ -2,13 +2,22 @@
 Resume Parser Module
 Handles text extraction from uploaded resume files (PDF, DOCX, TXT, JSON)
 """
+import io
 import json
-import os
-import mimetypes
+import mmap
+import zipfile
+from xml.etree import ElementTree
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Iterable, Iterator, Tuple, Optional
 
 # PDF parsing
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
 try:
     import pdfplumber
     PDFPLUMBER_AVAILABLE = True
@@ -21,16 +30,58 @@ try:
 except ImportError:
     PYPDF2_AVAILABLE = False
 
-# DOCX parsing
+# Fast JSON - install with: pip install orjson
 try:
-    from docx import Document
-    DOCX_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    DOCX_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
+# Encoding detection - install with: pip install charset-normalizer
+try:
+    from charset_normalizer import from_bytes
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
 
-ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt', 'json'}
+
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'docx', 'txt', 'json'})
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+TXT_SNIFF_BYTES = 64 * 1024  # prefix handed to charset detection
+EXPECTED_SECTIONS = ('personal', 'experience', 'education', 'skills')
+
+
+def _load_json(filepath: str):
+    """Parse a UTF-8 JSON file (orjson.JSONDecodeError subclasses json's)"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw.decode('utf-8'))
+
+
+@contextmanager
+def _mapped(filepath: str):
+    """Map a file read-only so parsers seek over the page cache instead of copying it"""
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+
+# WordprocessingML namespace, as ElementTree spells tag names
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOCX_BREAKS = {_W + 'tab': '\t', _W + 'br': '\n', _W + 'cr': '\n'}
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """Text of a <w:p> the way python-docx reads it: runs, tabs and line breaks"""
+    parts = []
+    # Only run content: <w:pPr> also holds <w:tab> elements, but those are tab stops
+    for run in paragraph.iter(_W + 'r'):
+        for el in run:
+            if el.tag == _W + 't':
+                if el.text:
+                    parts.append(el.text)
+            elif el.tag in _DOCX_BREAKS:
+                parts.append(_DOCX_BREAKS[el.tag])
+    return "".join(parts)
 
 
 class ResumeParser:
@@ -44,7 +95,7 @@ class ResumeParser:
 
     def validate_file(self, filename: str, file_size: int) -> Tuple[bool, str]:
         """
-        Validate uploaded file by extension, size, and MIME type
+        Validate uploaded file by size and extension
 
         Returns:
             Tuple of (is_valid, error_message)
@@ -52,28 +103,13 @@ class ResumeParser:
         if not filename:
             return False, "No file provided"
 
-        # Check extension
-        ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
-        if ext not in ALLOWED_EXTENSIONS:
-            return False, f"Please upload a PDF, DOCX, TXT, or JSON file"
-
         # Check size
         if file_size > MAX_FILE_SIZE:
             return False, f"File exceeds 5MB limit"
 
-        # Check MIME type
-        mime_type, _ = mimetypes.guess_type(filename)
-        valid_mimes = {
-            'application/pdf',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'text/plain',
-            'application/json'
-        }
-
-        # MIME check is advisory - extension check is primary
-        if mime_type and mime_type not in valid_mimes:
-            # Some systems may not properly detect MIME, so we allow if extension is valid
-            pass
+        # Check extension
+        if self.get_file_extension(filename) not in ALLOWED_EXTENSIONS:
+            return False, f"Please upload a PDF, DOCX, TXT, or JSON file"
 
         return True, ""
 
@@ -106,75 +142,97 @@ class ResumeParser:
 
     def extract_text_from_pdf(self, filepath: str) -> Tuple[str, Optional[str]]:
         """
-        Extract text from PDF using pdfplumber (primary) or PyPDF2 (fallback)
+        Extract text from PDF using pypdfium2 (fast), pdfplumber or PyPDF2 (fallbacks)
         """
-        text = ""
-        error = None
-
-        # Try pdfplumber first (better layout handling)
+        # Try PDFium's native extractor first, then pdfplumber (better layout
+        # handling), then PyPDF2
+        readers = []
+        if PDFIUM_AVAILABLE:
+            readers.append(self._pdfium_pages)
         if PDFPLUMBER_AVAILABLE:
-            try:
-                with pdfplumber.open(filepath) as pdf:
-                    pages = []
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            pages.append(page_text)
-                    text = "\n\n".join(pages)
-
-                if text.strip():
-                    return text.strip(), None
-            except Exception as e:
-                error = f"pdfplumber error: {str(e)}"
-
-        # Fallback to PyPDF2
+            readers.append(self._pdfplumber_pages)
         if PYPDF2_AVAILABLE:
-            try:
-                with open(filepath, 'rb') as f:
-                    reader = PyPDF2.PdfReader(f)
-                    pages = []
-                    for page in reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            pages.append(page_text)
-                    text = "\n\n".join(pages)
+            readers.append(self._pypdf2_pages)
 
-                if text.strip():
-                    return text.strip(), None
-            except Exception as e:
-                error = f"PyPDF2 error: {str(e)}"
+        for pages in readers:
+            try:
+                text = self._join_pages(pages(filepath))
+                if text:
+                    return text, None
+            except Exception:
+                continue
 
-        if not text.strip():
-            return "", "Could not extract text (may be image-based or protected)"
+        return "", "Could not extract text (may be image-based or protected)"
 
-        return text.strip(), error
+    @staticmethod
+    def _pdfium_pages(filepath: str) -> Iterator[str]:
+        pdf = pdfium.PdfDocument(filepath)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_range().replace('\r\n', '\n')  # PDFium ends lines with CRLF
+                textpage.close()
+                page.close()
+                if page_text.strip():
+                    yield page_text
+        finally:
+            pdf.close()
+
+    @staticmethod
+    def _pdfplumber_pages(filepath: str) -> Iterator[str]:
+        with _mapped(filepath) as data, pdfplumber.open(data) as pdf:
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    yield page_text
+
+    @staticmethod
+    def _pypdf2_pages(filepath: str) -> Iterator[str]:
+        with _mapped(filepath) as data:
+            for page in PyPDF2.PdfReader(data).pages:
+                page_text = page.extract_text()
+                if page_text:
+                    yield page_text
+
+    @staticmethod
+    def _join_pages(pages: Iterable[str]) -> str:
+        """Write pages into one buffer instead of holding a list of them"""
+        buf = io.StringIO()
+        for page_text in pages:
+            buf.write(page_text)
+            buf.write("\n\n")
+        return buf.getvalue().strip()
 
     def extract_text_from_docx(self, filepath: str) -> Tuple[str, Optional[str]]:
         """
-        Extract text from DOCX using python-docx
+        Extract text from DOCX by reading word/document.xml in one pass
         """
-        if not DOCX_AVAILABLE:
-            return "", "DOCX support not available. Install python-docx."
-
         try:
-            doc = Document(filepath)
-            paragraphs = []
-
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    paragraphs.append(para.text.strip())
-
-            # Also extract from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text.strip())
-                    if row_text:
-                        paragraphs.append(" | ".join(row_text))
+            with zipfile.ZipFile(filepath) as z:
+                body = ElementTree.fromstring(z.read('word/document.xml')).find(_W + 'body')
 
-            text = "\n".join(paragraphs)
+            paragraphs = []
+            table_rows = []
+
+            for block in (body if body is not None else ()):
+                if block.tag == _W + 'p':
+                    para_text = _docx_paragraph_text(block).strip()
+                    if para_text:
+                        paragraphs.append(para_text)
+                elif block.tag == _W + 'tbl':
+                    # Tables go after the paragraphs, one " | " joined line per row
+                    for row in block.iterfind(_W + 'tr'):
+                        row_text = []
+                        for cell in row.iterfind(_W + 'tc'):
+                            cell_text = "\n".join(
+                                _docx_paragraph_text(p) for p in cell.iterfind(_W + 'p')
+                            ).strip()
+                            if cell_text:
+                                row_text.append(cell_text)
+                        if row_text:
+                            table_rows.append(" | ".join(row_text))
+
+            text = "\n".join(paragraphs + table_rows)
 
             if not text.strip():
                 return "", "Document appears to be empty"
@@ -188,18 +246,30 @@ class ResumeParser:
         """
         Extract text from TXT with encoding detection
         """
-        encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
+        try:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+        except Exception as e:
+            return "", f"Error reading file: {str(e)}"
+
+        # Read once, then decode the bytes in memory: utf-8 first, then the
+        # sniffed encoding (if charset-normalizer is installed), then fallbacks
+        encodings = ['utf-8']
+        if CHARSET_NORMALIZER_AVAILABLE and not raw.isascii():
+            best = from_bytes(raw[:TXT_SNIFF_BYTES]).best()
+            if best:
+                encodings.append(best.encoding)
+        encodings += ['utf-16', 'latin-1', 'cp1252']
 
         for encoding in encodings:
             try:
-                with open(filepath, 'r', encoding=encoding) as f:
-                    text = f.read()
-                    if text.strip():
-                        return text.strip(), None
-            except (UnicodeDecodeError, UnicodeError):
+                text = raw.decode(encoding)
+            except (UnicodeDecodeError, UnicodeError, LookupError):
                 continue
-            except Exception as e:
-                return "", f"Error reading file: {str(e)}"
+            # Match text-mode reads, which translate \r\n and \r to \n
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+            if text.strip():
+                return text.strip(), None
 
         return "", "Could not determine file encoding"
 
@@ -208,11 +278,12 @@ class ResumeParser:
         Parse JSON resume and convert to text for display, or validate structure
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_json(filepath)
 
             # Return the raw JSON as pretty-printed string for preview
             # The actual structured data will be used directly
+            if ORJSON_AVAILABLE:
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode(), None
             return json.dumps(data, indent=2), None
 
         except json.JSONDecodeError as e:
@@ -228,12 +299,10 @@ class ResumeParser:
             Tuple of (parsed_data, error_message)
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_json(filepath)
 
             # Basic validation - check for expected sections
-            expected_keys = ['personal', 'experience', 'education', 'skills']
-            missing = [k for k in expected_keys if k not in data]
+            missing = [k for k in EXPECTED_SECTIONS if k not in data]
 
             if missing:
                 # Not in our expected format, but still valid JSON
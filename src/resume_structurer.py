@@ -3,8 +3,10 @@ Resume Structurer Module
 Uses local Ollama LLM to extract and structure resume data from raw text
 """
 import json
+import os
 import re
 import subprocess
+import time
 from pathlib import Path
 from typing import Optional, Tuple
 from datetime import datetime
@@ -16,6 +18,78 @@ try:
 except ImportError:
     OLLAMA_AVAILABLE = False
 
+# Seconds to trust the last "is Ollama up with this model?" answer
+_OLLAMA_CHECK_TTL = 60
+
+# httpx (connect, read, write, pool) timeouts for the Ollama clients: give up
+# quickly on an unreachable host, but let generation take as long as it needs
+_OLLAMA_TIMEOUT = (5, None, None, None)
+
+# Fast JSON - install with: pip install orjson
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Balanced-bracket JSON finder shared with the other LLM modules
+try:
+    from .json_scan import read_until_json, scan_json
+except ImportError:
+    from json_scan import read_until_json, scan_json
+
+# Patterns used on every resume, compiled once
+# Email, phone and LinkedIn URL in one alternation, so a single pass finds all three
+_CONTACT_RE = re.compile(
+    r'(?P<email>[\w\.-]+@[\w\.-]+\.\w+)'
+    r'|(?P<phone>[\(]?\d{3}[\)]?[-.\s]?\d{3}[-.\s]?\d{4})'
+    r'|(?P<linkedin>(?i:linkedin\.com/in/)[\w-]+)'
+)
+
+# A line that is only a resume section header, e.g. "Work Experience:" or "SKILLS"
+_SECTION_RE = re.compile(
+    r'(?im)^[ \t]*(?:professional|work|relevant|technical|core|key)?[ \t]*'
+    r'(experience|work history|employment(?: history)?|education|academic background'
+    r'|skills|competencies|projects|certifications|licenses|summary|objective|profile'
+    r'|awards|honors|volunteer(?:ing)?|publications|languages|interests|references)'
+    r'[ \t]*:?[ \t]*$'
+)
+_SECTION_ALIASES = {
+    "experience": ("experience", "work history", "employment", "employment history"),
+    "education": ("education", "academic background"),
+    "skills": ("skills", "competencies"),
+}
+
+# Words that have to appear somewhere for a section to be worth an LLM call
+_SECTION_EVIDENCE = {
+    "experience": ("experience", "work history", "employment"),
+    "education": ("education", "academic", "university", "college", "bachelor", "master", "phd"),
+    "skills": ("skills", "competencies", "technologies", "proficient"),
+}
+
+
+def _has_section(text: str, keywords: Tuple[str, ...]) -> bool:
+    """Cheap substring check for any sign of a section, run before its LLM call"""
+    folded = text.casefold()
+    return any(keyword in folded for keyword in keywords)
+
+
+def _slice_section(text: str, section: str) -> str:
+    """
+    The parts of a resume under a section's headers, each up to the next header
+
+    Falls back to the whole text when no header for the section is found, so a
+    resume with unusual headings still gets the full-text prompt.
+    """
+    aliases = _SECTION_ALIASES[section]
+    headers = list(_SECTION_RE.finditer(text))
+    parts = []
+    for i, match in enumerate(headers):
+        if match.group(1).lower() in aliases:
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+            parts.append(text[match.start():end].strip())
+    return "\n\n".join(parts) if parts else text
+
 
 class ResumeStructurer:
     """
@@ -31,38 +105,84 @@ class ResumeStructurer:
         self.master_resume_path = Path(master_resume_path)
         self.model = model
         self.ollama_host = ollama_host
+        # Reused for every call so requests share one connection pool
+        self._client = ollama.Client(host=ollama_host, timeout=_OLLAMA_TIMEOUT) if OLLAMA_AVAILABLE else None
+        self._ollama_ok = None
+        self._ollama_checked_at = 0.0
 
     def _check_ollama(self) -> bool:
-        """Check if Ollama is running and model is available"""
+        """Check if Ollama is running and model is available (result reused for a minute)"""
+        now = time.monotonic()
+        if self._ollama_ok is not None and now - self._ollama_checked_at < _OLLAMA_CHECK_TTL:
+            return self._ollama_ok
+
+        base = self.model.split(":")[0]
         try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return self.model.split(":")[0] in result.stdout
+            if OLLAMA_AVAILABLE:
+                # One HTTP request on the existing client instead of spawning the CLI
+                models = self._client.list()["models"]
+                ok = any(base in (m.get("model") or m.get("name") or "") for m in models)
+            else:
+                result = subprocess.run(
+                    ["ollama", "list"],
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
+                ok = base in result.stdout
         except Exception:
-            return False
+            ok = False
+
+        self._ollama_ok, self._ollama_checked_at = ok, now
+        return ok
+
+    def _call_ollama(
+        self,
+        prompt: str,
+        system: str = None,
+        json_mode: bool = False,
+        num_predict: Optional[int] = None,
+        until_json: Optional[str] = None
+    ) -> str:
+        """
+        Make a call to the local Ollama instance
+
+        json_mode constrains the reply to valid JSON; num_predict caps the
+        tokens generated, so a rambling model stops once the answer fits.
+        until_json ('{' or '[') streams the reply and hangs up as soon as a
+        complete JSON value of that kind has arrived
+        """
+        # Low temperature: these are extraction/rewording tasks, not brainstorming
+        options = {"temperature": 0.2}
+        if num_predict:
+            options["num_predict"] = num_predict
 
-    def _call_ollama(self, prompt: str, system: str = None) -> str:
-        """Make a call to the local Ollama instance"""
         if OLLAMA_AVAILABLE:
             try:
-                response = ollama.chat(
+                response = self._client.chat(
                     model=self.model,
                     messages=[
                         {"role": "system", "content": system or "You are a helpful assistant that extracts structured data from resumes."},
                         {"role": "user", "content": prompt}
-                    ]
+                    ],
+                    format="json" if json_mode else "",
+                    options=options,
+                    stream=bool(until_json)
                 )
-                return response['message']['content']
+                if not until_json:
+                    return response['message']['content']
+                try:
+                    return read_until_json((chunk['message']['content'] for chunk in response), until_json)
+                finally:
+                    response.close()  # closing the stream early stops generation
             except Exception as e:
                 raise RuntimeError(f"Ollama error: {str(e)}")
         else:
             # Fallback to subprocess
             try:
                 cmd = ["ollama", "run", self.model, prompt]
+                if json_mode:
+                    cmd[2:2] = ["--format", "json"]
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
                 return result.stdout
             except Exception as e:
@@ -72,13 +192,78 @@ class ResumeStructurer:
         """Extract JSON from LLM response"""
         try:
             # Try to find JSON in response
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
+            json_text = scan_json(response)
+            if json_text:
+                return json.loads(json_text)
         except json.JSONDecodeError:
             pass
         return None
 
+    def _extract_all(self, resume_text: str) -> Optional[dict]:
+        """Extract every section with one JSON-mode call; None if the reply doesn't fit the schema"""
+        prompt = f"""Extract the contact information, work experience, education and skills from this resume. Return ONLY valid JSON.
+
+RESUME TEXT:
+{resume_text}
+
+Return one JSON object in this exact format (use empty strings/arrays if not found):
+{{
+    "personal": {{
+        "name": "Full Name",
+        "email": "email@example.com",
+        "phone": "(555) 555-5555",
+        "location": "City, State",
+        "linkedin": "linkedin.com/in/profile",
+        "summary": "Professional summary if present"
+    }},
+    "experience": [
+        {{
+            "company": "Company Name",
+            "title": "Job Title",
+            "location": "City, State",
+            "start_date": "YYYY-MM",
+            "end_date": "YYYY-MM or present",
+            "current": true or false,
+            "bullets": ["Achievement 1", "Achievement 2"]
+        }}
+    ],
+    "education": [
+        {{
+            "institution": "University Name",
+            "degree": "Bachelor of Science",
+            "field": "Computer Science",
+            "graduation_date": "YYYY-MM"
+        }}
+    ],
+    "skills": {{
+        "technical": ["Python", "SQL", "AWS"],
+        "soft": ["Leadership", "Communication"],
+        "tools": ["Excel", "Jira", "Git"]
+    }}
+}}"""
+
+        # Any surprise in the reply (call failure, wrong shape, odd field types)
+        # means None, so structure_resume falls back to the per-section calls
+        try:
+            data = self._extract_json(self._call_ollama(prompt, json_mode=True, num_predict=4096, until_json='{'))
+            if not (
+                data
+                and isinstance(data.get("personal"), dict)
+                and isinstance(data.get("experience"), list)
+                and isinstance(data.get("education"), list)
+                and isinstance(data.get("skills"), dict)
+            ):
+                return None
+
+            return {
+                "personal": self._format_personal(data["personal"]),
+                "experience": self._format_experience(data["experience"]),
+                "education": self._format_education(data["education"]),
+                "skills": self._format_skills(data["skills"])
+            }
+        except Exception:
+            return None
+
     def extract_personal_info(self, resume_text: str) -> dict:
         """Extract personal/contact information from resume text"""
         prompt = f"""Extract contact information from this resume. Return ONLY valid JSON.
@@ -97,22 +282,26 @@ Return JSON in this exact format (use empty strings if not found):
 }}"""
 
         try:
-            response = self._call_ollama(prompt)
+            response = self._call_ollama(prompt, json_mode=True, num_predict=384, until_json='{')
             data = self._extract_json(response)
             if data:
-                return {
-                    "name": data.get("name", ""),
-                    "email": data.get("email", ""),
-                    "phone": data.get("phone", ""),
-                    "location": data.get("location", ""),
-                    "linkedin": data.get("linkedin", ""),
-                    "summary": data.get("summary", "")
-                }
+                return self._format_personal(data)
         except Exception:
             pass
 
         return self._regex_extract_personal(resume_text)
 
+    def _format_personal(self, data: dict) -> dict:
+        """Format contact info to match master_resume schema"""
+        return {
+            "name": data.get("name") or "",
+            "email": data.get("email") or "",
+            "phone": data.get("phone") or "",
+            "location": data.get("location") or "",
+            "linkedin": data.get("linkedin") or "",
+            "summary": data.get("summary") or ""
+        }
+
     def _regex_extract_personal(self, text: str) -> dict:
         """Fallback regex extraction for personal info"""
         result = {
@@ -124,23 +313,18 @@ Return JSON in this exact format (use empty strings if not found):
             "summary": ""
         }
 
-        # Email
-        email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
-        if email_match:
-            result["email"] = email_match.group()
-
-        # Phone
-        phone_match = re.search(r'[\(]?\d{3}[\)]?[-.\s]?\d{3}[-.\s]?\d{4}', text)
-        if phone_match:
-            result["phone"] = phone_match.group()
-
-        # LinkedIn
-        linkedin_match = re.search(r'linkedin\.com/in/[\w-]+', text, re.IGNORECASE)
-        if linkedin_match:
-            result["linkedin"] = linkedin_match.group()
+        # Email, phone, LinkedIn - first of each, in one scan that stops once all are found
+        missing = {"email", "phone", "linkedin"}
+        for match in _CONTACT_RE.finditer(text):
+            kind = match.lastgroup
+            if kind in missing:
+                result[kind] = match.group()
+                missing.discard(kind)
+                if not missing:
+                    break
 
         # Name - usually first line or first notable text
-        lines = text.strip().split('\n')
+        lines = text.lstrip().split('\n', 5)  # only the first lines are looked at
         for line in lines[:5]:
             line = line.strip()
             if line and len(line) < 50 and not '@' in line and not line[0].isdigit():
@@ -151,10 +335,11 @@ Return JSON in this exact format (use empty strings if not found):
 
     def extract_experience(self, resume_text: str) -> list:
         """Extract work experience from resume text"""
+        section_text = _slice_section(resume_text, "experience")
         prompt = f"""Extract work experience from this resume. Return ONLY valid JSON.
 
 RESUME TEXT:
-{resume_text}
+{section_text}
 
 Return JSON array in this format:
 [
@@ -172,12 +357,12 @@ Return JSON array in this format:
 If no experience found, return empty array: []"""
 
         try:
-            response = self._call_ollama(prompt)
+            response = self._call_ollama(prompt, num_predict=2048, until_json='[')
 
             # Try to extract array
-            array_match = re.search(r'\[[\s\S]*\]', response)
-            if array_match:
-                data = json.loads(array_match.group())
+            array_text = scan_json(response, '[')
+            if array_text:
+                data = json.loads(array_text)
                 if isinstance(data, list):
                     return self._format_experience(data)
         except Exception:
@@ -191,7 +376,7 @@ If no experience found, return empty array: []"""
 
         for i, exp in enumerate(experience_list):
             bullets = []
-            for j, bullet in enumerate(exp.get("bullets", [])):
+            for j, bullet in enumerate(exp.get("bullets") or []):
                 if isinstance(bullet, str):
                     bullets.append({
                         "id": f"bullet_{j+1:03d}",
@@ -202,16 +387,16 @@ If no experience found, return empty array: []"""
                     })
 
             is_current = exp.get("current", False)
-            if not is_current and exp.get("end_date", "").lower() == "present":
+            if not is_current and (exp.get("end_date") or "").lower() == "present":
                 is_current = True
 
             formatted.append({
                 "id": f"exp_{i+1:03d}",
-                "company": exp.get("company", ""),
-                "title": exp.get("title", ""),
-                "location": exp.get("location", ""),
-                "start_date": exp.get("start_date", ""),
-                "end_date": "present" if is_current else exp.get("end_date", ""),
+                "company": exp.get("company") or "",
+                "title": exp.get("title") or "",
+                "location": exp.get("location") or "",
+                "start_date": exp.get("start_date") or "",
+                "end_date": "present" if is_current else (exp.get("end_date") or ""),
                 "current": is_current,
                 "bullets": bullets
             })
@@ -220,10 +405,11 @@ If no experience found, return empty array: []"""
 
     def extract_education(self, resume_text: str) -> list:
         """Extract education from resume text"""
+        section_text = _slice_section(resume_text, "education")
         prompt = f"""Extract education from this resume. Return ONLY valid JSON.
 
 RESUME TEXT:
-{resume_text}
+{section_text}
 
 Return JSON array in this format:
 [
@@ -238,11 +424,11 @@ Return JSON array in this format:
 If no education found, return empty array: []"""
 
         try:
-            response = self._call_ollama(prompt)
+            response = self._call_ollama(prompt, num_predict=512, until_json='[')
 
-            array_match = re.search(r'\[[\s\S]*\]', response)
-            if array_match:
-                data = json.loads(array_match.group())
+            array_text = scan_json(response, '[')
+            if array_text:
+                data = json.loads(array_text)
                 if isinstance(data, list):
                     return self._format_education(data)
         except Exception:
@@ -256,23 +442,24 @@ If no education found, return empty array: []"""
 
         for edu in education_list:
             formatted.append({
-                "institution": edu.get("institution", ""),
-                "degree": edu.get("degree", ""),
-                "field": edu.get("field", ""),
-                "graduation_date": edu.get("graduation_date", ""),
-                "gpa": edu.get("gpa", ""),
-                "honors": edu.get("honors", []),
-                "relevant_coursework": edu.get("relevant_coursework", [])
+                "institution": edu.get("institution") or "",
+                "degree": edu.get("degree") or "",
+                "field": edu.get("field") or "",
+                "graduation_date": edu.get("graduation_date") or "",
+                "gpa": edu.get("gpa") or "",
+                "honors": edu.get("honors") or [],
+                "relevant_coursework": edu.get("relevant_coursework") or []
             })
 
         return formatted
 
     def extract_skills(self, resume_text: str) -> dict:
         """Extract skills from resume text"""
+        section_text = _slice_section(resume_text, "skills")
         prompt = f"""Extract skills from this resume. Categorize them. Return ONLY valid JSON.
 
 RESUME TEXT:
-{resume_text}
+{section_text}
 
 Return JSON in this format:
 {{
@@ -284,15 +471,10 @@ Return JSON in this format:
 If no skills found, return empty arrays."""
 
         try:
-            response = self._call_ollama(prompt)
+            response = self._call_ollama(prompt, json_mode=True, num_predict=512, until_json='{')
             data = self._extract_json(response)
             if data:
-                return {
-                    "technical": data.get("technical", []),
-                    "soft": data.get("soft", []),
-                    "tools": data.get("tools", []),
-                    "certifications": data.get("certifications", [])
-                }
+                return self._format_skills(data)
         except Exception:
             pass
 
@@ -303,6 +485,15 @@ If no skills found, return empty arrays."""
             "certifications": []
         }
 
+    def _format_skills(self, data: dict) -> dict:
+        """Format skills to match master_resume schema"""
+        return {
+            "technical": data.get("technical") or [],
+            "soft": data.get("soft") or [],
+            "tools": data.get("tools") or [],
+            "certifications": data.get("certifications") or []
+        }
+
     def structure_resume(self, resume_text: str, use_ai: bool = True) -> Tuple[dict, Optional[str]]:
         """
         Full resume structuring - extract all sections
@@ -333,17 +524,30 @@ If no skills found, return empty arrays."""
             }, "Ollama not available. Only basic extraction performed."
 
         try:
+            # One call for everything; per-section calls only if that reply is unusable
+            print("   Extracting all sections...")
+            structured = self._extract_all(resume_text)
+            if structured:
+                return structured, None
+
             print("   Extracting personal info...")
             personal = self.extract_personal_info(resume_text)
 
-            print("   Extracting experience...")
-            experience = self.extract_experience(resume_text)
+            # Sections with no trace in the text come back empty without a call
+            experience = []
+            if _has_section(resume_text, _SECTION_EVIDENCE["experience"]):
+                print("   Extracting experience...")
+                experience = self.extract_experience(resume_text)
 
-            print("   Extracting education...")
-            education = self.extract_education(resume_text)
+            education = []
+            if _has_section(resume_text, _SECTION_EVIDENCE["education"]):
+                print("   Extracting education...")
+                education = self.extract_education(resume_text)
 
-            print("   Extracting skills...")
-            skills = self.extract_skills(resume_text)
+            skills = {"technical": [], "soft": [], "tools": [], "certifications": []}
+            if _has_section(resume_text, _SECTION_EVIDENCE["skills"]):
+                print("   Extracting skills...")
+                skills = self.extract_skills(resume_text)
 
             return {
                 "personal": personal,
@@ -385,10 +589,13 @@ If no skills found, return empty arrays."""
 
             # Add new experience entries only
             existing_exp = {(e["company"], e["title"], e["start_date"]) for e in result.get("experience", [])}
-            for exp in extracted_data.get("experience", []):
-                key = (exp["company"], exp["title"], exp["start_date"])
-                if key not in existing_exp:
-                    result.setdefault("experience", []).insert(0, exp)
+            new_exps = [
+                exp for exp in extracted_data.get("experience", [])
+                if (exp["company"], exp["title"], exp["start_date"]) not in existing_exp
+            ]
+            if new_exps:
+                # One splice instead of an insert(0) per entry; reversed keeps the old ordering
+                result["experience"] = new_exps[::-1] + result.get("experience", [])
 
             # Add new education entries only
             existing_edu = {(e["institution"], e["degree"]) for e in result.get("education", [])}
@@ -399,10 +606,12 @@ If no skills found, return empty arrays."""
 
             # Add new skills only
             for category in ["technical", "soft", "tools", "certifications"]:
-                existing = set(s.lower() for s in result.get("skills", {}).get(category, []))
+                existing = {s.casefold() for s in result.get("skills", {}).get(category, [])}
                 for skill in extracted_data.get("skills", {}).get(category, []):
-                    if skill.lower() not in existing:
+                    folded = skill.casefold()
+                    if folded not in existing:
                         result.setdefault("skills", {}).setdefault(category, []).append(skill)
+                        existing.add(folded)
 
             return result
 
@@ -416,10 +625,13 @@ If no skills found, return empty arrays."""
 
             # Add new experience entries
             existing_exp = {(e["company"], e["title"], e["start_date"]) for e in result.get("experience", [])}
-            for exp in extracted_data.get("experience", []):
-                key = (exp["company"], exp["title"], exp["start_date"])
-                if key not in existing_exp:
-                    result.setdefault("experience", []).insert(0, exp)
+            new_exps = [
+                exp for exp in extracted_data.get("experience", [])
+                if (exp["company"], exp["title"], exp["start_date"]) not in existing_exp
+            ]
+            if new_exps:
+                # One splice instead of an insert(0) per entry; reversed keeps the old ordering
+                result["experience"] = new_exps[::-1] + result.get("experience", [])
 
             # Add new education entries
             existing_edu = {(e["institution"], e["degree"]) for e in result.get("education", [])}
@@ -433,11 +645,12 @@ If no skills found, return empty arrays."""
                 existing = result.get("skills", {}).get(category, [])
                 new_skills = extracted_data.get("skills", {}).get(category, [])
 
-                existing_lower = {s.lower() for s in existing}
+                existing_folded = {s.casefold() for s in existing}
                 for skill in new_skills:
-                    if skill.lower() not in existing_lower:
+                    folded = skill.casefold()
+                    if folded not in existing_folded:
                         existing.append(skill)
-                        existing_lower.add(skill.lower())
+                        existing_folded.add(folded)
 
                 result.setdefault("skills", {})[category] = existing
 
@@ -480,7 +693,14 @@ If no skills found, return empty arrays."""
         # Update metadata
         resume_data.setdefault("meta", {})["last_updated"] = datetime.now().strftime("%Y-%m-%d")
 
-        with open(save_path, 'w') as f:
-            json.dump(resume_data, f, indent=2)
+        # Write to a sibling temp file and swap it in, so a crash can't truncate the resume
+        tmp_path = save_path.with_suffix(".json.tmp")
+        if ORJSON_AVAILABLE:
+            raw = orjson.dumps(resume_data, option=orjson.OPT_INDENT_2)
+        else:
+            raw = json.dumps(resume_data, indent=2).encode()
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_path, save_path)
 
         return str(save_path)
@@ -3,11 +3,14 @@ Resume Tailor Module
 Uses local Ollama LLM to rewrite resume bullets based on job descriptions
 """
 import json
-import re
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
 from dataclasses import dataclass
+from typing import Optional, Tuple
 import subprocess
+import time
 
 # Ollama Python client - install with: pip install ollama
 try:
@@ -16,6 +19,36 @@ try:
 except ImportError:
     OLLAMA_AVAILABLE = False
 
+# Keep the model (and its prompt cache) loaded between tailoring runs
+_KEEP_ALIVE = "10m"
+
+# Tailored bullets kept in memory for reuse across runs
+_BULLET_CACHE_SIZE = 2048
+
+# Seconds to trust the last "is Ollama up with this model?" answer
+_OLLAMA_CHECK_TTL = 60
+
+# httpx (connect, read, write, pool) timeouts for the Ollama clients: give up
+# quickly on an unreachable host, but let generation take as long as it needs
+_OLLAMA_TIMEOUT = (5, None, None, None)
+
+# Bump when a prompt or the shape of tailor_full_resume's output changes, so
+# results stored by earlier versions are not reused
+PROMPT_VERSION = 1
+
+# Fast JSON - install with: pip install orjson
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Balanced-bracket JSON finder shared with the other LLM modules
+try:
+    from .json_scan import read_until_json, scan_json
+except ImportError:
+    from json_scan import read_until_json, scan_json
+
 
 @dataclass
 class TailoredResume:
@@ -32,57 +65,183 @@ class TailoredResume:
 class ResumeTailor:
     """
     Uses local LLM to tailor resume content to specific job descriptions
+    
+    `model` handles keyword extraction and the summary, which need structured
+    output or free writing. Bullet rewording is a narrow task and most of the
+    calls, so it goes to the smaller `bullet_model`: several times faster, at
+    the cost of slightly plainer phrasing. If that model isn't pulled, bullets
+    use `model`; pass bullet_model=None to always do so.
     """
     
     def __init__(
         self,
         master_resume_path: str = "data/master_resume.json",
         model: str = "llama3.1:8b",  # or mistral, gemma2, etc.
-        ollama_host: str = "http://localhost:11434"
+        bullet_model: Optional[str] = "llama3.2:3b",  # or qwen2.5:3b, etc.
+        ollama_host: str = "http://localhost:11434",
+        ollama_hosts: Optional[list] = None,  # several Ollama servers to spread calls across
+        parallel: int = 4  # LLM calls in flight at once while tailoring
     ):
         self.master_resume_path = Path(master_resume_path)
         self.model = model
+        self.bullet_model = bullet_model
         self.ollama_host = ollama_host
-        self.master_resume = self._load_master_resume()
+        self.ollama_hosts = list(ollama_hosts) if ollama_hosts else [ollama_host]
+        self.parallel = max(1, parallel)
+        self._ollama_ok = None
+        self._bullet_model_ok = False
+        self._ollama_checked_at = 0.0
+        
+        # One long-lived client (and connection pool) per host, used round-robin
+        self._clients = [ollama.Client(host=h, timeout=_OLLAMA_TIMEOUT) for h in self.ollama_hosts] if OLLAMA_AVAILABLE else []
+        self._next_client = itertools.cycle(self._clients)
+        self._client_lock = threading.Lock()
+        
+        # Tailored bullets by (model, system prompt, original bullet)
+        self._bullet_cache = {}
+        self._bullet_cache_lock = threading.Lock()
+        
+        self._master_mtime_ns = None
+        self._master_resume = None
+        self._load_master_resume()
         
     def _load_master_resume(self) -> dict:
-        """Load the master resume JSON"""
+        """Load the master resume JSON, re-reading only when the file changes"""
         if not self.master_resume_path.exists():
             raise FileNotFoundError(f"Master resume not found: {self.master_resume_path}")
         
-        with open(self.master_resume_path, 'r') as f:
-            return json.load(f)
+        mtime_ns = self.master_resume_path.stat().st_mtime_ns
+        if mtime_ns != self._master_mtime_ns:
+            with open(self.master_resume_path, 'rb') as f:
+                raw = f.read()
+            self._master_resume = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            self._master_mtime_ns = mtime_ns
+        
+        return self._master_resume
+    
+    @property
+    def master_resume(self) -> dict:
+        """Current master resume (picks up edits made after startup)"""
+        return self._load_master_resume()
     
     def _check_ollama(self) -> bool:
-        """Check if Ollama is running and model is available"""
+        """Check if Ollama is running and model is available (result reused for a minute)"""
+        now = time.monotonic()
+        if self._ollama_ok is not None and now - self._ollama_checked_at < _OLLAMA_CHECK_TTL:
+            return self._ollama_ok
+        
+        base = self.model.split(":")[0]
+        bullet_ok = False
         try:
-            result = subprocess.run(
-                ["ollama", "list"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return self.model.split(":")[0] in result.stdout
+            if OLLAMA_AVAILABLE:
+                # Ask every host on its existing client; calls only go to hosts that
+                # have the model, so a dead one shows up here rather than mid-run
+                healthy = []
+                bullet_ok = bool(self.bullet_model)
+                for client in self._clients:
+                    try:
+                        names = [m.get("model") or m.get("name") or "" for m in client.list()["models"]]
+                    except Exception:
+                        continue
+                    if any(base in name for name in names):
+                        healthy.append(client)
+                        if self.bullet_model:
+                            bullet_ok = bullet_ok and any(
+                                name in (self.bullet_model, f"{self.bullet_model}:latest") for name in names
+                            )
+                ok = bool(healthy)
+                bullet_ok = ok and bullet_ok
+                with self._client_lock:
+                    self._next_client = itertools.cycle(healthy or self._clients)
+            else:
+                result = subprocess.run(
+                    ["ollama", "list"],
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
+                ok = base in result.stdout
+                bullet_ok = bool(self.bullet_model) and self.bullet_model in result.stdout
         except Exception:
-            return False
+            ok = False
+        
+        self._ollama_ok, self._bullet_model_ok, self._ollama_checked_at = ok, bullet_ok, now
+        return ok
+    
+    def active_bullet_model(self) -> str:
+        """Model for bullet rewrites: bullet_model when it's pulled, otherwise model"""
+        if self.bullet_model and self.bullet_model != self.model:
+            self._check_ollama()
+            if self._bullet_model_ok:
+                return self.bullet_model
+        return self.model
     
-    def _call_ollama(self, prompt: str, system: str = None) -> str:
-        """Make a call to the local Ollama instance"""
+    def _call_ollama(
+        self,
+        prompt: str,
+        system: str = None,
+        json_mode: bool = False,
+        num_predict: Optional[int] = None,
+        until_json: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
+        """
+        Make a call to the local Ollama instance
+        
+        json_mode constrains the reply to valid JSON; num_predict caps the
+        tokens generated, so a rambling model stops once the answer fits.
+        until_json ('{' or '[') streams the reply and hangs up as soon as a
+        complete JSON value of that kind has arrived. model overrides
+        self.model for this call
+        """
+        return self._chat(prompt, system, json_mode, num_predict, until_json, model)[0]
+    
+    def _chat(
+        self,
+        prompt: str,
+        system: str = None,
+        json_mode: bool = False,
+        num_predict: Optional[int] = None,
+        until_json: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """_call_ollama, also returning why generation stopped ("stop", "length", or None if unknown)"""
+        model = model or self.model
+        # Low temperature: these are extraction/rewording tasks, not brainstorming
+        options = {"temperature": 0.2}
+        if num_predict:
+            options["num_predict"] = num_predict
+        
         if OLLAMA_AVAILABLE:
-            response = ollama.chat(
-                model=self.model,
+            with self._client_lock:
+                client = next(self._next_client)
+            response = client.chat(
+                model=model,
                 messages=[
                     {"role": "system", "content": system or "You are a professional resume writer."},
                     {"role": "user", "content": prompt}
-                ]
+                ],
+                format="json" if json_mode else "",
+                options=options,
+                keep_alive=_KEEP_ALIVE,
+                stream=bool(until_json)
             )
-            return response['message']['content']
+            if not until_json:
+                return response['message']['content'], response.get('done_reason')
+            try:
+                return read_until_json((chunk['message']['content'] for chunk in response), until_json), None
+            finally:
+                response.close()  # closing the stream early stops generation
         else:
-            # Fallback to subprocess if ollama package not installed
-            import subprocess
-            cmd = ["ollama", "run", self.model, prompt]
+            # Fallback to subprocess if ollama package not installed; the CLI
+            # takes no system message, so instructions go ahead of the prompt
+            if system:
+                prompt = f"{system}\n\n{prompt}"
+            cmd = ["ollama", "run", model, prompt]
+            if json_mode:
+                cmd[2:2] = ["--format", "json"]
             result = subprocess.run(cmd, capture_output=True, text=True)
-            return result.stdout
+            return result.stdout, None
     
     def extract_keywords(self, job_description: str) -> dict:
         """Extract key skills, requirements, and keywords from a job description"""
@@ -104,37 +263,34 @@ Respond ONLY with valid JSON in this exact format:
     "company_values": ["value1", "value2"]
 }}"""
 
-        response = self._call_ollama(prompt)
+        response = self._call_ollama(prompt, json_mode=True, num_predict=512, until_json='{')
         
         # Parse JSON from response
         try:
             # Find JSON in response
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
+            json_text = scan_json(response)
+            if json_text:
+                return json.loads(json_text)
         except json.JSONDecodeError:
             pass
         
         return {"error": "Could not parse keywords", "raw_response": response}
     
-    def tailor_bullet(
-        self,
-        original_bullet: str,
-        job_keywords: dict,
-        job_title: str,
-        company: str
-    ) -> str:
-        """Rewrite a single resume bullet to match job requirements"""
-        
+    def _cache_bullet(self, key: tuple, tailored: str):
+        """Remember a tailored bullet, dropping the oldest entries past the size cap"""
+        with self._bullet_cache_lock:
+            self._bullet_cache[key] = tailored
+            while len(self._bullet_cache) > _BULLET_CACHE_SIZE:
+                del self._bullet_cache[next(iter(self._bullet_cache))]
+    
+    def _bullet_system_prompt(self, job_keywords: dict, job_title: str, company: str) -> str:
+        """Instructions shared by every bullet for one job, sent as the system message"""
         keywords_str = ", ".join(
             job_keywords.get("required_skills", []) +
             job_keywords.get("industry_keywords", [])
         )
         
-        prompt = f"""Rewrite this resume bullet point to better match a {job_title} position at {company}.
-
-ORIGINAL BULLET:
-{original_bullet}
+        return f"""You are a professional resume writer. Rewrite the resume bullet point you are given to better match a {job_title} position at {company}.
 
 TARGET KEYWORDS TO INCORPORATE (where relevant):
 {keywords_str}
@@ -149,15 +305,41 @@ RULES:
 7. Sound human, not robotic
 
 Respond with ONLY the rewritten bullet point, nothing else."""
+    
+    def tailor_bullet(
+        self,
+        original_bullet: str,
+        job_keywords: dict,
+        job_title: str,
+        company: str,
+        system: str = None,
+        model: Optional[str] = None
+    ) -> str:
+        """
+        Rewrite a single resume bullet to match job requirements
+        
+        The job context lives in the system message and only the bullet in the
+        user message, so Ollama can reuse the evaluated prefix across bullets.
+        Pass a prebuilt system prompt to skip rebuilding it per bullet. Runs on
+        the bullet model unless another model is given.
+        """
+        system = system or self._bullet_system_prompt(job_keywords, job_title, company)
+        return self._rewrite_bullet(original_bullet, system, model or self.active_bullet_model())[0]
+    
+    def _rewrite_bullet(self, original_bullet: str, system: str, model: str) -> Tuple[str, bool]:
+        """The rewritten bullet, and whether it is complete enough to cache"""
+        prompt = f"""ORIGINAL BULLET:
+{original_bullet}"""
 
-        response = self._call_ollama(prompt)
+        response, done_reason = self._chat(prompt, system=system, num_predict=128, model=model)
         
         # Clean up response
         bullet = response.strip()
         bullet = bullet.lstrip("•-*").strip()
         bullet = bullet.strip('"\'')
         
-        return bullet
+        # An empty reply or one cut off at num_predict shouldn't repeat on later runs
+        return bullet, bool(bullet) and done_reason != "length"
     
     def tailor_summary(
         self,
@@ -198,7 +380,7 @@ RULES:
 
 Respond with ONLY the summary paragraph, nothing else."""
 
-        response = self._call_ollama(prompt)
+        response = self._call_ollama(prompt, num_predict=192)
         return response.strip().strip('"\'')
     
     def tailor_full_resume(
@@ -214,6 +396,8 @@ Respond with ONLY the summary paragraph, nothing else."""
         Returns a dict with all resume sections tailored to the job
         """
         print(f"📝 Tailoring resume for: {job_title} at {company}")
+        master = self.master_resume
+        self._check_ollama()  # refreshes which hosts get calls (reused for a minute)
         
         # Step 1: Extract keywords from JD
         print("   Analyzing job description...")
@@ -223,56 +407,82 @@ Respond with ONLY the summary paragraph, nothing else."""
             print(f"   ⚠️  Warning: {keywords['error']}")
             keywords = {"required_skills": [], "industry_keywords": []}
         
-        # Step 2: Tailor summary
-        print("   Writing tailored summary...")
-        tailored_summary = self.tailor_summary(
-            job_description, job_title, company, keywords
-        )
+        # Steps 2 and 3 only need the keywords, so the summary and every bullet
+        # are sent at once; Ollama runs them in its parallel slots (or across
+        # hosts) and queues the rest
+        print("   Writing tailored summary and bullets...")
+        
+        # Most recent first, regardless of the order entries were added in
+        experience = sorted(master.get("experience", []), key=lambda e: e.get("start_date") or "", reverse=True)
         
-        # Step 3: Tailor experience bullets
-        print("   Tailoring experience bullets...")
-        tailored_experience = []
-        
-        for job in self.master_resume.get("experience", []):
-            tailored_job = {
-                "company": job["company"],
-                "title": job["title"],
-                "location": job["location"],
-                "start_date": job["start_date"],
-                "end_date": "Present" if job.get("current") else job["end_date"],
-                "bullets": []
-            }
+        pool = ThreadPoolExecutor(max_workers=self.parallel)
+        try:
+            summary_future = pool.submit(
+                self.tailor_summary, job_description, job_title, company, keywords
+            )
+            bullet_system = self._bullet_system_prompt(keywords, job_title, company)
+            bullet_model = self.active_bullet_model()
             
-            for bullet_data in job.get("bullets", []):
-                original = bullet_data["original"]
-                tailored = self.tailor_bullet(
-                    original, keywords, job_title, company
-                )
-                tailored_job["bullets"].append(tailored)
+            # Each distinct bullet is rewritten once: repeats (boilerplate shared
+            # across jobs) and bullets tailored in an earlier run for the same
+            # prompt come from the cache instead of another LLM call
+            tailored_bullets = {}
+            pending = {}
+            for job in experience:
+                for bullet_data in job.get("bullets", []):
+                    original = bullet_data["original"]
+                    if original in tailored_bullets or original in pending:
+                        continue
+                    cached = self._bullet_cache.get((bullet_model, bullet_system, original))
+                    if cached is not None:
+                        tailored_bullets[original] = cached
+                    else:
+                        pending[original] = pool.submit(
+                            self._rewrite_bullet, original, bullet_system, bullet_model
+                        )
+            
+            for original, future in pending.items():
+                tailored_bullets[original], cacheable = future.result()
+                if cacheable:
+                    self._cache_bullet((bullet_model, bullet_system, original), tailored_bullets[original])
             
-            tailored_experience.append(tailored_job)
+            tailored_experience = []
+            for job in experience:
+                tailored_experience.append({
+                    "company": job["company"],
+                    "title": job["title"],
+                    "location": job["location"],
+                    "start_date": job["start_date"],
+                    "end_date": "Present" if job.get("current") else job["end_date"],
+                    "bullets": [tailored_bullets[b["original"]] for b in job.get("bullets", [])]
+                })
+            tailored_summary = summary_future.result()
+        finally:
+            # On a failed call, drop the requests that haven't started yet
+            pool.shutdown(cancel_futures=True)
         
         # Step 4: Highlight relevant skills
         print("   Matching skills...")
         all_candidate_skills = (
-            self.master_resume.get("skills", {}).get("technical", []) +
-            self.master_resume.get("skills", {}).get("tools", []) +
-            self.master_resume.get("skills", {}).get("soft", [])
+            master.get("skills", {}).get("technical", []) +
+            master.get("skills", {}).get("tools", []) +
+            master.get("skills", {}).get("soft", [])
         )
         
-        required = set(s.lower() for s in keywords.get("required_skills", []))
-        matched_skills = [s for s in all_candidate_skills if s.lower() in required]
+        # casefold() so "ÉCOLE"/"école" and "Straße"/"STRASSE" match too
+        required = {s.casefold() for s in keywords.get("required_skills", [])}
+        matched_skills = [s for s in all_candidate_skills if s.casefold() in required]
         
         # Build final tailored resume
         tailored_resume = {
             "job_id": job_id,
             "job_title": job_title,
             "company": company,
-            "personal": self.master_resume["personal"].copy(),
+            "personal": master["personal"].copy(),
             "summary": tailored_summary,
             "experience": tailored_experience,
-            "education": self.master_resume.get("education", []),
-            "skills": self.master_resume.get("skills", {}),
+            "education": master.get("education", []),
+            "skills": master.get("skills", {}),
             "skills_highlighted": matched_skills,
             "keywords_extracted": keywords,
             "created_at": __import__("datetime").datetime.now().isoformat()
@@ -294,8 +504,12 @@ Respond with ONLY the summary paragraph, nothing else."""
         filename = f"resume_{company_slug}_{tailored_resume['job_id']}.json"
         
         filepath = output_path / filename
-        with open(filepath, 'w') as f:
-            json.dump(tailored_resume, f, indent=2)
+        if ORJSON_AVAILABLE:
+            raw = orjson.dumps(tailored_resume, option=orjson.OPT_INDENT_2)
+        else:
+            raw = json.dumps(tailored_resume, indent=2).encode()
+        with open(filepath, 'wb') as f:
+            f.write(raw)
         
         print(f"   📄 Saved: {filepath}")
         return filepath
@@ -310,7 +524,10 @@ if __name__ == "__main__":
     parser.add_argument("--title", "-t", help="Job title", required=True)
     parser.add_argument("--company", "-c", help="Company name", required=True)
     parser.add_argument("--model", "-m", help="Ollama model", default="llama3.1:8b")
+    parser.add_argument("--bullet-model", help="Smaller model for bullet rewrites", default="llama3.2:3b")
     parser.add_argument("--resume", "-r", help="Master resume path", default="data/master_resume.json")
+    parser.add_argument("--host", action="append", help="Ollama host URL (repeat to spread calls across servers)")
+    parser.add_argument("--parallel", "-p", type=int, default=4, help="LLM calls in flight at once")
     
     args = parser.parse_args()
     
@@ -323,7 +540,10 @@ if __name__ == "__main__":
     
     tailor = ResumeTailor(
         master_resume_path=args.resume,
-        model=args.model
+        model=args.model,
+        bullet_model=args.bullet_model,
+        ollama_hosts=args.host,
+        parallel=args.parallel
     )
     
     result = tailor.tailor_full_resume(
@@ -0,0 +1,57 @@
+"""
+Tests for the job database
+Run with: python -m unittest discover tests
+"""
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from job_scraper import JobScraper
+
+
+class MigrateJsonTest(unittest.TestCase):
+    def test_legacy_file_with_nan_salaries(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            # What the pre-SQLite version wrote via json.dump for jobs without a salary
+            (Path(data_dir) / "jobs_database.json").write_text("""{
+  "jobs": [
+    {"id": "a1", "title": "Data Analyst", "company": "Acme", "location": "Atlanta, GA",
+     "description": "SQL", "url": "https://example.com/1", "salary_min": NaN,
+     "salary_max": 90000.0, "status": "applied"}
+  ],
+  "last_updated": "2024-01-01T00:00:00"
+}""")
+
+            jobs = JobScraper(data_dir=data_dir).search_saved()
+
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0]["id"], "a1")
+        self.assertIsNone(jobs[0]["salary_min"])
+        self.assertEqual(jobs[0]["salary_max"], 90000.0)
+        self.assertEqual(jobs[0]["status"], "applied")
+
+
+class SearchSavedTest(unittest.TestCase):
+    def test_limit_keeps_oldest_rows(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            scraper = JobScraper(data_dir=data_dir)
+            conn = scraper._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO jobs (id, title, company, location, description, url) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(f"j{i}", "Analyst", "Acme", "", "", f"https://example.com/{i}") for i in range(8)]
+                )
+            conn.close()
+
+            recent = scraper.search_saved(limit=5)
+            filtered = scraper.search_saved(company="acme", limit=2)
+
+        self.assertEqual([job["id"] for job in recent], ["j0", "j1", "j2", "j3", "j4"])
+        self.assertEqual([job["id"] for job in filtered], ["j0", "j1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
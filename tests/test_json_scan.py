@@ -0,0 +1,73 @@
+"""
+Tests for the JSON finder used on LLM replies
+Run with: python -m unittest discover tests
+"""
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from json_scan import read_until_json, scan_json
+
+
+class ScanJsonTest(unittest.TestCase):
+    def test_braces_inside_strings(self):
+        text = '{"bullet": "Cut costs } and { kept going", "n": 1} trailing }'
+        self.assertEqual(json.loads(scan_json(text)), {"bullet": "Cut costs } and { kept going", "n": 1})
+
+    def test_escaped_quotes_and_backslashes(self):
+        value = {"a": 'say "hi" }', "path": "C:\\dir\\", "b": "\\\"}"}
+        text = "Here: " + json.dumps(value) + " done"
+        self.assertEqual(json.loads(scan_json(text)), value)
+
+    def test_nested_objects_and_arrays(self):
+        value = {"experience": [{"bullets": ["a", "b"], "meta": {"x": [1, [2, 3]]}}]}
+        self.assertEqual(json.loads(scan_json(json.dumps(value))), value)
+        self.assertEqual(json.loads(scan_json("x " + json.dumps(value["experience"]), "[")), value["experience"])
+
+    def test_leading_prose_and_markdown_fence(self):
+        text = 'Sure! Here is the data:\n```json\n{"name": "Jane"}\n```\nLet me know.'
+        self.assertEqual(scan_json(text), '{"name": "Jane"}')
+
+    def test_first_value_wins(self):
+        self.assertEqual(scan_json('[1] [2, 3]', '['), '[1]')
+
+    def test_truncated_or_unbalanced(self):
+        self.assertIsNone(scan_json('{"name": "Jane", "skills": ["a"'))
+        self.assertIsNone(scan_json('{"name": "unterminated }'))
+        self.assertIsNone(scan_json('no json here'))
+        self.assertIsNone(scan_json(''))
+
+
+class ReadUntilJsonTest(unittest.TestCase):
+    def _pieces(self, text, size, consumed):
+        for i in range(0, len(text), size):
+            consumed.append(i)
+            yield text[i:i + size]
+
+    def test_stops_once_value_is_complete(self):
+        consumed = []
+        text = read_until_json(self._pieces('ok {"a": 1} and then a lot more chatter', 4, consumed))
+        self.assertEqual(scan_json(text), '{"a": 1}')
+        self.assertLess(len(consumed), 10)
+
+    def test_token_split_across_chunks(self):
+        value = {"a": 'x\\"}y', "b": [1, {"c": "}"}]}
+        raw = json.dumps(value) + " tail"
+        for size in range(1, 8):
+            with self.subTest(size=size):
+                text = read_until_json(self._pieces(raw, size, []))
+                self.assertEqual(json.loads(scan_json(text)), value)
+
+    def test_array_opener(self):
+        text = read_until_json(iter(['[{"x": "]"}', ', 2', ']', ' more']), '[')
+        self.assertEqual(text, '[{"x": "]"}, 2]')
+
+    def test_incomplete_stream_returns_everything(self):
+        self.assertEqual(read_until_json(iter(['{"a": ', '[1, 2'])), '{"a": [1, 2')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,14 @@
+"""
+Job Hunter - WSGI entry point for running under a production server
+
+    gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:5050 --chdir /path/to/job-hunter wsgi:application
+    waitress-serve --listen=0.0.0.0:5050 --threads=8 wsgi:application
+
+Keep to ONE worker process and scale with threads: tailoring progress, the
+master resume write-behind cache and the output index all live in process
+memory, so a second worker would not see the first one's state. Paths are
+relative to the project folder, so start the server from there (or --chdir).
+"""
+from app import app as application
+
+__all__ = ["application"]